@@ -185,12 +185,14 @@
             uvicorn
             pydantic
             httpx
+            h2
             click
             pillow
             poetry-core
             lxml
             construct
             pygments
+            orjson
             uvloop
             httptools
             python-dotenv
@@ -245,7 +247,7 @@
             echo ""
 
             echo "To run the uiautodev server:"
-            echo "  uvicorn uiautodev.app:app --host 127.0.0.1 --port 20242 --reload"
+            echo "  uvicorn uiautodev.app:app --host 127.0.0.1 --port 20242 --reload --loop uvloop --http httptools"
             echo ""
             echo "Access the server at: http://127.0.0.1:20242"
             echo ""
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The LLM service imports its backends as top-level packages
+# (services.llm...), the way the dev shell's PYTHONPATH=./uiautodev sets up.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "uiautodev")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,67 @@
+import pytest
+
+from uiautodev.utils import cache as cache_module
+from uiautodev.utils.cache import LRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entry_expires_on_get(clock):
+    cache = LRUCache(maxsize=4, ttl=10)
+    cache.put("a", 1)
+    clock[0] += 9.9
+    assert cache.get("a") == 1
+    clock[0] += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_put_refreshes_expiry(clock):
+    cache = LRUCache(maxsize=4, ttl=10)
+    cache.put("a", 1)
+    clock[0] += 8
+    cache.put("a", 2)
+    clock[0] += 8
+    assert cache.get("a") == 2
+
+
+def test_get_does_not_refresh_expiry(clock):
+    cache = LRUCache(maxsize=4, ttl=10)
+    cache.put("a", 1)
+    clock[0] += 8
+    assert cache.get("a") == 1
+    clock[0] += 2
+    assert cache.get("a") is None
+
+
+def test_without_ttl_entries_never_expire(clock):
+    cache = LRUCache(maxsize=4)
+    cache.put("a", 1)
+    clock[0] += 1e9
+    assert cache.get("a") == 1
+
+
+def test_evicts_least_recently_used_at_capacity():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # now "b" is the least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_put_of_existing_key_counts_as_use():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 10
@@ -0,0 +1,51 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from uiautodev.router.device import make_router
+
+
+class BrokenProvider:
+    def get_device_driver(self, serial):
+        raise RuntimeError("device offline")
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(make_router(BrokenProvider()), prefix="/api/android")
+    return TestClient(app)
+
+
+def test_install_app_error_shape(client):
+    response = client.post(
+        "/api/android/abc/command/installApp", json={"url": "http://x/a.apk"}
+    )
+    assert response.status_code == 500
+    assert response.json() == {
+        "success": False,
+        "reason": "device offline",
+        "error": "device offline",
+    }
+
+
+def test_current_app_error_shape(client):
+    response = client.get("/api/android/abc/command/currentApp")
+    assert response.status_code == 500
+    assert response.json() == {
+        "package": None,
+        "activity": None,
+        "pid": None,
+        "error": "device offline",
+    }
+
+
+def test_interactive_python_error_keeps_session_shape(client):
+    response = client.post(
+        "/api/android/abc/interactive_python", json={"code": "print(1)"}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["stderr"] == "Internal server error: device offline"
+    assert body["stdout"] == "" and body["result"] is None
+    assert "RuntimeError" in body["execution_error"]
@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from model import LlmServiceChatRequest
+from services.llm.backends import deepseek, openai
+from services.llm.backends.sse import END_EXCEPTION
+
+
+def _refuse_connection(request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectError("connection refused", request=request)
+
+
+@pytest.fixture
+def unreachable_backends(monkeypatch):
+    monkeypatch.setattr(deepseek, "DEEPSEEK_API_KEY", "test-key")
+    monkeypatch.setattr(openai, "OPENAI_API_KEY", "test-key")
+    for backend in (deepseek, openai):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(_refuse_connection))
+        monkeypatch.setattr(backend, "_client", client)
+    yield
+    # Each test drives its own event loop, so don't hand these clients on
+    deepseek._client = None
+    openai._client = None
+
+
+def _request(provider: str) -> LlmServiceChatRequest:
+    # Preset RAG context keeps the tests off the network
+    return LlmServiceChatRequest(
+        prompt="hi", context={"rag_code_snippets": "none"}, provider=provider
+    )
+
+
+async def _collect(backend, request: LlmServiceChatRequest) -> bytes:
+    return b"".join(
+        [chunk async for chunk in backend.generate_chat_completion_stream(request)]
+    )
+
+
+@pytest.mark.parametrize(
+    "backend,provider", [(deepseek, "deepseek"), (openai, "openai")]
+)
+def test_connect_error_yields_error_and_end_frames(
+    unreachable_backends, backend, provider
+):
+    body = asyncio.run(_collect(backend, _request(provider)))
+    assert b"event: error\ndata: " in body
+    assert b"connection refused" in body
+    assert body.endswith(END_EXCEPTION)
+
+
+@pytest.mark.parametrize("provider", ["deepseek", "openai"])
+def test_chat_endpoint_streams_upstream_errors(unreachable_backends, provider):
+    from uiautodev.app import app
+
+    response = TestClient(app).post(
+        "/api/llm/chat",
+        json={
+            "prompt": "hi",
+            "context": {"rag_code_snippets": "none"},
+            "provider": provider,
+        },
+    )
+    assert response.status_code == 200
+    assert b"event: error" in response.content
+    assert END_EXCEPTION in response.content
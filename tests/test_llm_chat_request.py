@@ -0,0 +1,36 @@
+from uiautodev.app import HISTORY_REQUEST_MAX_MESSAGES, ApiLlmChatRequest
+from uiautodev.model import ChatMessageContent
+from uiautodev.services.llm.prompt.messages import build_llm_payload_messages
+
+
+def _conversation(turns: int) -> list:
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"question {i}"})
+        history.append({"role": "assistant", "content": f"answer {i}"})
+    return history
+
+
+def test_long_history_is_trimmed_not_rejected():
+    raw = _conversation(HISTORY_REQUEST_MAX_MESSAGES)
+    request = ApiLlmChatRequest(prompt="next", history=raw)
+
+    assert len(request.history) == HISTORY_REQUEST_MAX_MESSAGES
+    assert request.history[0].content == "question 0"
+    assert request.history[-1].content == raw[-1]["content"]
+
+
+def test_trimming_keeps_the_prompt_window():
+    raw = _conversation(HISTORY_REQUEST_MAX_MESSAGES)
+    request = ApiLlmChatRequest(prompt="next", history=raw)
+    full = [ChatMessageContent(**msg) for msg in raw]
+
+    assert build_llm_payload_messages(
+        "next", {}, request.history, "system"
+    ) == build_llm_payload_messages("next", {}, full, "system")
+
+
+def test_short_history_is_untouched():
+    raw = _conversation(3)
+    request = ApiLlmChatRequest(prompt="next", history=raw)
+    assert [msg.content for msg in request.history] == [m["content"] for m in raw]
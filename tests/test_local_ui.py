@@ -0,0 +1,28 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from uiautodev import app as app_module
+
+ETAG = app_module._UI_HTML_ETAG
+
+
+@pytest.fixture
+def client():
+    return TestClient(app_module.app)
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    [ETAG, f"W/{ETAG}", f'"other", {ETAG}', f'"other",W/{ETAG}', "*"],
+)
+def test_matching_validator_gets_304(client, if_none_match):
+    response = client.get("/demo", headers={"If-None-Match": if_none_match})
+    assert response.status_code == 304
+    assert response.headers["etag"] == ETAG
+
+
+@pytest.mark.parametrize("if_none_match", ['"other"', 'W/"other", "stale"', ""])
+def test_other_validators_get_the_page(client, if_none_match):
+    response = client.get("/demo", headers={"If-None-Match": if_none_match})
+    assert response.status_code == 200
+    assert response.content == app_module._UI_HTML
@@ -0,0 +1,48 @@
+import io
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from uiautodev import app as app_module
+from uiautodev.model import OCRNode
+
+
+def _png_upload() -> dict:
+    buf = io.BytesIO()
+    Image.new("RGB", (8, 8), "white").save(buf, format="PNG")
+    return {"file": ("screen.png", buf.getvalue(), "image/png")}
+
+
+@pytest.fixture
+def client():
+    app_module._ocr_cache.clear()
+    yield TestClient(app_module.app)
+    app_module._ocr_cache.clear()
+
+
+def test_ocr_failure_before_first_node_is_a_500(client, monkeypatch):
+    def failing_ocr(image):
+        raise RuntimeError("engine crashed")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(app_module, "ocr_image", failing_ocr)
+    response = client.post("/api/ocr_image", files=_png_upload())
+    assert response.status_code == 500
+    assert response.json() == {"error": "OCR failed", "detail": "engine crashed"}
+
+
+def test_ocr_failure_mid_stream_ends_with_error_line(client, monkeypatch):
+    def partial_ocr(image):
+        yield OCRNode(key="0", name="Hello", bounds=(0, 0, 1, 1), confidence=0.9)
+        raise RuntimeError("engine crashed")
+
+    monkeypatch.setattr(app_module, "ocr_image", partial_ocr)
+    response = client.post("/api/ocr_image", files=_png_upload())
+    assert response.status_code == 200
+    lines = [orjson.loads(line) for line in response.content.splitlines()]
+    assert lines[0]["name"] == "Hello"
+    assert lines[-1] == {"error": "OCR failed", "detail": "engine crashed"}
+    # A failed run must not be served from the cache next time
+    assert len(app_module._ocr_cache) == 0
@@ -0,0 +1,66 @@
+import pytest
+
+from uiautodev.model import ChatMessageContent, ToolCall, ToolCallFunction
+from uiautodev.services.llm.prompt import messages
+
+
+@pytest.fixture(autouse=True)
+def small_window(monkeypatch):
+    monkeypatch.setattr(messages, "HISTORY_MAX_MESSAGES", 6)
+    monkeypatch.setattr(messages, "HISTORY_HEAD_MESSAGES", 2)
+    monkeypatch.setattr(messages, "HISTORY_TAIL_MESSAGES", 4)
+
+
+def _msg(role: str, content: str, **fields) -> ChatMessageContent:
+    return ChatMessageContent(role=role, content=content, **fields)
+
+
+def _tool_call(call_id: str) -> ChatMessageContent:
+    call = ToolCall(
+        id=call_id, function=ToolCallFunction(name="search", arguments="{}")
+    )
+    return _msg("assistant", "", tool_calls=[call])
+
+
+def _contents(history):
+    return [msg.content for msg in history]
+
+
+def test_short_history_is_kept_whole():
+    history = [_msg("user", "u0"), _msg("assistant", "a1"), _msg("user", "u2")]
+    assert messages._window_history(history, "next") == history
+
+
+def test_tool_pairs_are_not_split_at_the_cuts():
+    history = [
+        _msg("user", "u0"),
+        _tool_call("c1"),  # last head message
+        _msg("tool", "t2", tool_call_id="c1"),
+        _msg("assistant", "a3"),
+        _msg("user", "u4"),
+        _tool_call("c5"),
+        _msg("tool", "t6", tool_call_id="c5"),  # first tail message
+        _msg("assistant", "a7"),
+        _msg("user", "u8"),
+        _msg("assistant", "a9"),
+    ]
+    windowed = messages._window_history(history, "next")
+    assert _contents(windowed) == ["u0", "a7", "u8", "a9"]
+
+
+def test_trailing_echo_of_the_prompt_is_dropped():
+    history = [_msg("user", "u0"), _msg("assistant", "a1"), _msg("user", "next")]
+    assert _contents(messages._window_history(history, "next")) == ["u0", "a1"]
+
+
+def test_trailing_user_message_that_differs_is_kept():
+    history = [_msg("user", "u0"), _msg("assistant", "a1"), _msg("user", "other")]
+    assert messages._window_history(history, "next") == history
+
+
+def test_echo_is_dropped_before_windowing():
+    # Seven messages, one of them the echo: fits the window once it is gone
+    history = [_msg("user", f"m{i}") for i in range(6)] + [_msg("user", "next")]
+    assert _contents(messages._window_history(history, "next")) == [
+        f"m{i}" for i in range(6)
+    ]
@@ -0,0 +1,89 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import jedi
+import pytest
+
+from uiautodev.utils import python_completion as pc
+
+CODE = "import os\nos.pa"
+
+
+@pytest.fixture
+def in_process_worker(monkeypatch):
+    """Initialize jedi in this process, the way _init_worker does in a worker"""
+    monkeypatch.setattr(pc, "PRELOAD_MODULES", [])
+    monkeypatch.setattr(pc, "_script_cache", pc.LRUCache(maxsize=32))
+    pc._init_worker(str(pc.PROJECT_ROOT), pc._project_sys_path(), False)
+    yield
+    monkeypatch.setattr(pc, "_jedi_project", None)
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    """Route completions through a thread pool running a fake _do_complete"""
+    calls = []
+
+    def fake_complete(code, path, line, column):
+        calls.append((code, path, line, column))
+        return [("th", "path", "module")]
+
+    monkeypatch.setattr(pc, "_completion_cache", pc.LRUCache(maxsize=8))
+    monkeypatch.setattr(pc, "_do_complete", fake_complete)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        monkeypatch.setattr(pc, "_jedi_pool", pool)
+        yield calls
+
+
+def test_repeat_request_is_served_from_cache(thread_pool):
+    first = asyncio.run(pc.complete_code(CODE, None, 2, 5))
+    second = asyncio.run(pc.complete_code(CODE, None, 2, 5))
+
+    assert first == second == (("th", "path", "module"),)
+    assert len(thread_pool) == 1
+
+
+def test_cache_is_keyed_on_cursor_position(thread_pool):
+    asyncio.run(pc.complete_code(CODE, None, 2, 5))
+    asyncio.run(pc.complete_code(CODE, None, 2, 4))
+    assert len(thread_pool) == 2
+
+
+def test_only_first_completions_are_resolved(in_process_worker, monkeypatch):
+    monkeypatch.setattr(pc, "COMPLETION_RESOLVE_LIMIT", 2)
+    results = pc._do_complete("import os\nos.", None, 2, 3)
+
+    assert len(results) > 2
+    assert all(type_ is not None for _, _, type_ in results[:2])
+    assert all(type_ is None for _, _, type_ in results[2:])
+
+
+def test_script_is_reused_for_unchanged_code(in_process_worker, monkeypatch):
+    created = []
+    real_script = jedi.Script
+
+    def counting_script(*args, **kwargs):
+        created.append(kwargs.get("code"))
+        return real_script(*args, **kwargs)
+
+    monkeypatch.setattr(jedi, "Script", counting_script)
+    pc._do_complete(CODE, None, 2, 5)
+    pc._do_complete(CODE, None, 2, 4)
+    pc._do_complete(CODE + "t", None, 2, 6)
+
+    assert created == [CODE, CODE + "t"]
+
+
+def test_pool_can_restart_after_shutdown(monkeypatch):
+    # Workers are spawned and read this from the environment
+    monkeypatch.setenv("UIAUTODEV_PRELOAD_MODULES", "")
+    monkeypatch.setattr(pc, "_completion_cache", pc.LRUCache(maxsize=8))
+    try:
+        for _ in range(2):
+            pc.warm_up_pool()
+            result = asyncio.run(pc.complete_code(CODE, None, 2, 5))
+            assert "path" in {display for _, display, _ in result}
+            pc.shutdown_pool()
+            pc._completion_cache.clear()
+    finally:
+        pc.shutdown_pool()
@@ -0,0 +1,40 @@
+import dataclasses
+import os
+import signal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from uiautodev import app as app_module
+
+
+@pytest.fixture
+def kills(monkeypatch):
+    sent = []
+    monkeypatch.setattr(os, "kill", lambda pid, sig: sent.append((pid, sig)))
+    return sent
+
+
+def _with_workers(monkeypatch, workers: int) -> None:
+    settings = dataclasses.replace(app_module.server_settings(), workers=workers)
+    monkeypatch.setattr(app_module, "server_settings", lambda: settings)
+
+
+def test_default_is_a_single_worker(monkeypatch):
+    monkeypatch.setenv("UIAUTODEV_RELOAD", "false")
+    monkeypatch.delenv("UIAUTODEV_WORKERS", raising=False)
+    app_module.server_settings.cache_clear()
+    try:
+        assert app_module.server_settings().workers == 1
+    finally:
+        app_module.server_settings.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "workers,target", [(1, os.getpid), (4, os.getppid)], ids=["single", "multi"]
+)
+def test_shutdown_signals_the_right_process(monkeypatch, kills, workers, target):
+    _with_workers(monkeypatch, workers)
+    response = TestClient(app_module.app).get("/shutdown")
+    assert response.status_code == 200
+    assert kills == [(target(), signal.SIGINT)]
@@ -0,0 +1,86 @@
+import asyncio
+import inspect
+
+from uiautodev import app as app_module
+from uiautodev.app import _SSE_PING, _buffered_sse
+
+
+async def _collect(stream, limit: int = 100) -> list:
+    out = []
+    async for chunk in stream:
+        out.append(chunk)
+        if len(out) >= limit:
+            break
+    return out
+
+
+def test_chat_stream_is_an_async_generator():
+    # StreamingResponse would pay a thread hop per chunk of a sync generator
+    assert inspect.isasyncgenfunction(app_module.generate_chat_completion_stream)
+
+
+def test_flushes_once_batch_reaches_max_bytes():
+    async def source():
+        for chunk in ("aaaa", b"bbbb", "cccc"):
+            yield chunk
+
+    out = asyncio.run(_collect(_buffered_sse(source(), max_bytes=8, max_ms=10_000)))
+    assert out == [b"aaaabbbb", b"cccc"]
+
+
+def test_flushes_partial_batch_after_max_ms():
+    async def run():
+        release = asyncio.Event()
+
+        async def source():
+            yield "a"
+            await release.wait()
+            yield "b"
+
+        stream = _buffered_sse(source(), max_bytes=1024, max_ms=10, ping_s=60)
+        # Arrives while the source is still blocked, so only the timer flushed it
+        first = await asyncio.wait_for(stream.__anext__(), timeout=1)
+        release.set()
+        return [first] + await _collect(stream)
+
+    assert asyncio.run(run()) == [b"a", b"b"]
+
+
+def test_idle_stream_gets_keepalive_pings():
+    async def source():
+        await asyncio.sleep(0.2)
+        yield "x"
+
+    out = asyncio.run(_collect(_buffered_sse(source(), max_ms=1, ping_s=0.05)))
+    assert out[-1] == b"x"
+    assert out[:-1] and set(out[:-1]) == {_SSE_PING}
+
+
+def test_disconnected_client_stops_the_source():
+    async def run():
+        closed = asyncio.Event()
+        polls = []
+
+        async def source():
+            try:
+                yield "a"
+                await asyncio.Event().wait()
+                yield "never"
+            finally:
+                closed.set()
+
+        async def is_disconnected() -> bool:
+            polls.append(True)
+            return len(polls) >= 2
+
+        out = await _collect(
+            _buffered_sse(
+                source(), max_ms=1, ping_s=0.01, is_disconnected=is_disconnected
+            )
+        )
+        await asyncio.wait_for(closed.wait(), timeout=1)
+        return out, len(polls)
+
+    out, polls = asyncio.run(run())
+    assert out[0] == b"a"
+    assert polls == 2
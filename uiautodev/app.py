@@ -1,35 +1,56 @@
 # uiautodev/app.py
-import json
+import asyncio
+import hashlib
 import logging
 import os
 import platform
+import re
 import signal
-import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-import jedi
+import orjson
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI, File, HTTPException, Request, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import (
-    FileResponse,
-    JSONResponse,
+    ORJSONResponse,
     RedirectResponse,
     StreamingResponse,
 )
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
-
-from uiautodev.model import ChatMessageContent
+from PIL import UnidentifiedImageError
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 # --- Early .env loading and diagnostics ---
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DOTENV_PATH = PROJECT_ROOT / ".env"
 
-if DOTENV_PATH.exists():
+# uvicorn workers and reloads inherit the environment of the process that
+# already loaded .env, so only the first import reads it.
+_dotenv_pending = os.getenv("UIAUTODEV_ENV_LOADED") != "1"
+_dotenv_found = _dotenv_pending and DOTENV_PATH.exists()
+if _dotenv_found:
     load_dotenv(dotenv_path=DOTENV_PATH, override=True, verbose=False)
+os.environ["UIAUTODEV_ENV_LOADED"] = "1"
+
 # Ensure logging is configured before other modules that might log
 logging.basicConfig(
     level=os.getenv("UIAUTODEV_LOG_LEVEL", "info").upper(),
@@ -38,7 +59,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-if not DOTENV_PATH.exists():
+if _dotenv_pending and not _dotenv_found:
     logger.warning(
         f"app.py - .env file not found at {DOTENV_PATH}. "
         "Relying on system environment variables or defaults."
@@ -48,45 +69,182 @@ if not DOTENV_PATH.exists():
 from uiautodev import __version__
 from uiautodev.common import convert_bytes_to_image, ocr_image
 from uiautodev.model import ChatMessageContent as LlmServiceChatMessage
-from uiautodev.model import Node
+from uiautodev.model import OCRNode
 from uiautodev.provider import AndroidProvider
 from uiautodev.router.device import make_router
+from uiautodev.services.llm.prompt.messages import (
+    CONSOLE_OUTPUT_TAIL_CHARS,
+    HISTORY_HEAD_MESSAGES,
+    HISTORY_MAX_MESSAGES,
+    TRACEBACK_HEAD_CHARS,
+)
 from uiautodev.services.llm_service import (
     LlmServiceChatRequest,
+    aclose_backend_clients,
     generate_chat_completion_stream,
 )
+from uiautodev.utils.cache import LRUCache
+from uiautodev.utils.python_completion import (
+    complete_code,
+    shutdown_pool,
+    warm_up_pool,
+)
 
 # --- FastAPI App Initialization ---
 app = FastAPI(
     title="uiautodev Local Server",
     description="Backend server for the local uiautodev inspection and automation tool.",
     version=__version__,
+    default_response_class=ORJSONResponse,
 )
 
+
+# --- Server Settings ---
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("true", "1", "yes")
+
+
+@dataclass(frozen=True)
+class ServerSettings:
+    port: int
+    host: str
+    reload: bool
+    log_level: str
+    workers: int
+    access_log: bool
+    keep_alive: int
+    max_concurrency: int
+
+
+@lru_cache(maxsize=1)
+def server_settings() -> ServerSettings:
+    """Server options read from the environment, parsed once per process"""
+    reload_enabled = _env_flag("UIAUTODEV_RELOAD", "True")
+    return ServerSettings(
+        port=int(os.getenv("UIAUTODEV_PORT", "20242")),
+        host=os.getenv("UIAUTODEV_HOST", "127.0.0.1"),
+        reload=reload_enabled,
+        log_level=os.getenv("UIAUTODEV_LOG_LEVEL", "info").lower(),
+        # Opt-in only, and never with reload (uvicorn cannot combine them).
+        # Caches, interactive sessions and the jedi pool are per worker.
+        workers=1 if reload_enabled else int(os.getenv("UIAUTODEV_WORKERS", "1")),
+        access_log=_env_flag("UIAUTODEV_ACCESS_LOG", "False"),
+        # Idle keep-alive long enough to span chat turns, and a cap on
+        # concurrent connections (beyond it uvicorn answers 503).
+        keep_alive=int(os.getenv("UIAUTODEV_KEEPALIVE", "75")),
+        max_concurrency=int(os.getenv("UIAUTODEV_MAX_CONCURRENCY", "512")),
+    )
+
+
 # --- Global State for Tracking Running Processes ---
+# Per worker process: with UIAUTODEV_WORKERS > 1 an interrupt only sees
+# processes started by the worker that handles it.
 ACTIVE_PROCESSES: Dict[str, int] = {}
 
 
 # --- Static Files Mounting ---
+# Asset names are not content-hashed, so they get a bounded max-age rather
+# than "immutable". HTML always revalidates so a new build is picked up.
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+HTML_CACHE_CONTROL = "no-cache"
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that adds a Cache-Control header to every asset.
+    Starlette already sends an ETag, so expired entries revalidate with a 304.
+    """
+
+    def file_response(self, full_path, *args, **kwargs) -> Response:
+        response = super().file_response(full_path, *args, **kwargs)
+        cache_control = (
+            HTML_CACHE_CONTROL
+            if str(full_path).endswith(".html")
+            else STATIC_CACHE_CONTROL
+        )
+        response.headers.setdefault("Cache-Control", cache_control)
+        return response
+
+
 current_file_dir = Path(__file__).parent
 static_files_path = current_file_dir / "static"
 if static_files_path.is_dir():
-    app.mount("/static", StaticFiles(directory=static_files_path), name="static")
+    # The directory was just checked, skip StaticFiles' own check.
+    app.mount(
+        "/static",
+        CachedStaticFiles(directory=static_files_path, check_dir=False),
+        name="static",
+    )
 else:
     logger.error(
         f"Static files directory not found at: {static_files_path}. UI may not load correctly."
     )
 
+
 # --- Middleware ---
+class StreamSafeGZipMiddleware:
+    """GZip everything except streamed or already-compressed responses.
+    Compressing a stream buffers it inside zlib, delaying each chunk.
+    """
+
+    EXCLUDED_PATHS = re.compile(r"^/api/(llm/chat|ocr_image)$|/screenshot/|/backupApp$")
+
+    def __init__(self, app: ASGIApp, **gzip_options: Any):
+        self.app = app
+        self.gzip_app = GZipMiddleware(app, **gzip_options)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not self.EXCLUDED_PATHS.search(scope["path"]):
+            await self.gzip_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+class SameOriginCORSMiddleware:
+    """CORS that skips the inspector's own UI assets when requested
+    same-origin, which is the common case of a browser on 127.0.0.1.
+    """
+
+    BYPASS_PATHS = re.compile(r"^/(static/|demo$)")
+
+    def __init__(self, app: ASGIApp, **cors_options: Any):
+        self.app = app
+        self.cors_app = CORSMiddleware(app, **cors_options)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and self.BYPASS_PATHS.search(scope["path"]):
+            headers = dict(scope["headers"])
+            origin = headers.get(b"origin")
+            if origin is None or origin.split(b"://", 1)[-1] == headers.get(b"host"):
+                await self.app(scope, receive, send)
+                return
+        await self.cors_app(scope, receive, send)
+
+
+# Explicit origins (the server itself and the Vite dev server) let the
+# middleware take its exact-match path; max_age lets browsers cache preflights.
+_server_port = server_settings().port
+CORS_ALLOW_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv(
+        "UIAUTODEV_CORS_ORIGINS",
+        f"http://127.0.0.1:{_server_port},http://localhost:{_server_port},"
+        "http://localhost:5173",
+    ).split(",")
+    if origin.strip()
+]
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
+    SameOriginCORSMiddleware,
+    allow_origins=CORS_ALLOW_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    max_age=86400,
 )
+app.add_middleware(StreamSafeGZipMiddleware, minimum_size=1024, compresslevel=4)
 
 # --- Providers and Routers ---
+# Each uvicorn worker gets its own provider. That is safe: it holds no
+# per-client state, and devices are always addressed by serial.
 android_provider = AndroidProvider()
 android_router = make_router(android_provider)
 app.include_router(android_router, prefix="/api/android", tags=["Android"])
@@ -102,18 +260,46 @@ class InfoResponse(BaseModel):
     drivers: List[str]
 
 
-class ApiChatMessage(BaseModel):
-    role: str
-    content: str
+# Longest history accepted as sent. Kept well above the prompt window (plus
+# the echoed prompt) so trimming here never changes what the model sees.
+HISTORY_REQUEST_MAX_MESSAGES = max(200, HISTORY_MAX_MESSAGES + 2)
 
 
 class ApiLlmChatRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     prompt: str
     context: Dict[str, Any] = {}
-    history: List[ApiChatMessage] = []
+    # Validated straight into the service's message model, so the history can
+    # be handed to the LLM service as-is.
+    history: List[LlmServiceChatMessage] = []
     provider: Optional[str] = "deepseek"
-    temperature: Optional[float] = None
-    max_tokens: Optional[int] = None
+    temperature: Optional[float] = Field(default=None, ge=0.0, le=2.0)
+    max_tokens: Optional[int] = Field(default=None, ge=1, le=8192)
+
+    @field_validator("context")
+    @classmethod
+    def trim_context(cls, context: Dict[str, Any]) -> Dict[str, Any]:
+        # Drop what the prompt builder would cut anyway, so a large console
+        # buffer is not held for the whole LLM call.
+        out = context.get("pythonConsoleOutput")
+        if isinstance(out, str) and len(out) > CONSOLE_OUTPUT_TAIL_CHARS:
+            context["pythonConsoleOutput"] = out[-CONSOLE_OUTPUT_TAIL_CHARS:]
+        trace = context.get("pythonLastErrorTraceback")
+        if isinstance(trace, str) and len(trace) > TRACEBACK_HEAD_CHARS:
+            context["pythonLastErrorTraceback"] = trace[:TRACEBACK_HEAD_CHARS]
+        return context
+
+    @field_validator("history", mode="before")
+    @classmethod
+    def trim_history(cls, history: Any) -> Any:
+        # The web UI sends its whole conversation on every turn. Past the cap,
+        # drop the middle before validating it: the prompt builder keeps only
+        # the head and the tail of the history anyway.
+        if isinstance(history, list) and len(history) > HISTORY_REQUEST_MAX_MESSAGES:
+            tail = HISTORY_REQUEST_MAX_MESSAGES - HISTORY_HEAD_MESSAGES
+            history = history[:HISTORY_HEAD_MESSAGES] + history[-tail:]
+        return history
 
 
 class PythonCompletionRequest(BaseModel):
@@ -139,49 +325,33 @@ class InterruptRequest(BaseModel):
 
 
 # --- Python Completion API Endpoint ---
-try:
-    jedi_project_path = str(PROJECT_ROOT)
-    logger.info(
-        f"Initializing Jedi Project with path: {jedi_project_path} and current sys.path."
-    )
-    jedi_project = jedi.Project(
-        path=jedi_project_path, sys_path=sys.path, smart_sys_path=True
-    )
-except Exception as e:
-    logger.error(f"Failed to initialize Jedi Project: {e}", exc_info=True)
-    jedi_project = None
-
-
 @app.post("/api/python/completions", response_model=List[PythonCompletionSuggestion])
 async def get_python_completions(request_data: PythonCompletionRequest):
-    if not jedi_project:
-        logger.error("Jedi project not initialized, cannot provide completions.")
-        return []
     try:
         jedi_line = request_data.line + 1
         jedi_column = request_data.column
-        script = jedi.Script(
-            code=request_data.code, path=request_data.filename, project=jedi_project
+        completions = await complete_code(
+            request_data.code, request_data.filename, jedi_line, jedi_column
         )
-        completions = script.complete(line=jedi_line, column=jedi_column)
-        suggestions = []
-        if completions:
-            for comp in completions:
-                display_text_value = getattr(comp, "name_with_symbols", comp.name)
-                text_to_insert = getattr(comp, "complete", comp.name)
-                suggestions.append(
-                    PythonCompletionSuggestion(
-                        text=text_to_insert,
-                        displayText=display_text_value,
-                        type=comp.type,
-                    )
-                )
-        return suggestions
+        return [
+            PythonCompletionSuggestion(text=text, displayText=display_text, type=type_)
+            for text, display_text, type_ in completions
+        ]
     except Exception as e:
         logger.error(f"Error during Jedi completion processing: {e}", exc_info=True)
         return []
 
 
+@app.on_event("startup")
+def start_completion_workers():
+    warm_up_pool()
+
+
+@app.on_event("shutdown")
+def stop_completion_workers():
+    shutdown_pool()
+
+
 # --- ✅ UPDATED: Interrupt Endpoint ---
 @app.post("/api/python/interrupt", status_code=204)
 async def interrupt_python_execution(request: InterruptRequest):
@@ -222,18 +392,97 @@ async def interrupt_python_execution(request: InterruptRequest):
 
 
 # --- LLM Chat API Endpoint ---
+# StreamingResponse iterates a sync generator through the threadpool, paying a
+# thread hop per chunk. Every generator handed to it here must be async
+# (tests/test_sse_buffering.py checks generate_chat_completion_stream).
+
+
+SSE_BATCH_BYTES = int(os.getenv("UIAUTODEV_SSE_BATCH_BYTES", "8192"))
+SSE_FLUSH_MS = float(os.getenv("UIAUTODEV_SSE_FLUSH_MS", "25"))
+# Idle streams get an SSE comment frame this often, so proxies and browsers
+# keep the connection open while the LLM is still thinking.
+SSE_PING_S = float(os.getenv("UIAUTODEV_SSE_PING_S", "15"))
+_SSE_PING = b": ping\n\n"
+# How often an idle stream checks whether the client has gone away.
+SSE_DISCONNECT_POLL_S = 1.0
+
+
+async def _buffered_sse(
+    source: AsyncGenerator[Union[str, bytes], None],
+    max_bytes: int = SSE_BATCH_BYTES,
+    max_ms: float = SSE_FLUSH_MS,
+    ping_s: float = SSE_PING_S,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Coalesce small chunks from source into fewer, larger writes.
+    A batch is flushed once it reaches max_bytes, or max_ms after its first
+    chunk arrived, whichever comes first. A ping comment is sent after
+    ping_s seconds without output. While idle, is_disconnected is polled
+    and a gone client stops the source, releasing its upstream request.
+    """
+    loop = asyncio.get_running_loop()
+    iterator = source.__aiter__()
+    buf = bytearray()
+    deadline: Optional[float] = None
+    last_write = loop.time()
+    idle_poll_s = min(ping_s, SSE_DISCONNECT_POLL_S)
+    # The pending read is kept across flush timeouts instead of being
+    # cancelled, since cancelling an async generator mid-step closes it.
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            if deadline is None:
+                timeout = idle_poll_s
+            else:
+                timeout = max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                if buf:
+                    yield bytes(buf)
+                    buf.clear()
+                    deadline = None
+                    last_write = loop.time()
+                elif is_disconnected is not None and await is_disconnected():
+                    logger.info("Client disconnected, aborting the stream.")
+                    break
+                elif loop.time() - last_write >= ping_s:
+                    yield _SSE_PING
+                    last_write = loop.time()
+                continue
+
+            task, pending = pending, None
+            try:
+                chunk = task.result()
+            except StopAsyncIteration:
+                break
+            buf += chunk.encode() if isinstance(chunk, str) else chunk
+            if len(buf) >= max_bytes:
+                yield bytes(buf)
+                buf.clear()
+                deadline = None
+                last_write = loop.time()
+            elif deadline is None:
+                deadline = loop.time() + max_ms / 1000
+        if buf:
+            yield bytes(buf)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
 @app.post("/api/llm/chat")
 async def handle_llm_chat_via_service(
     client_request_data: ApiLlmChatRequest, http_request: Request
 ):
-    service_history = [
-        ChatMessageContent.model_validate(msg.model_dump())
-        for msg in client_request_data.history
-    ]
-    service_request_data = LlmServiceChatRequest(
+    # The request body was validated on ingress; model_construct skips a second
+    # validation pass over the (growing) history on every chat turn.
+    service_request_data = LlmServiceChatRequest.model_construct(
         prompt=client_request_data.prompt,
         context=client_request_data.context,
-        history=service_history,
+        history=client_request_data.history,
         provider=client_request_data.provider,
         temperature=client_request_data.temperature,
         max_tokens=client_request_data.max_tokens,
@@ -242,42 +491,142 @@ async def handle_llm_chat_via_service(
         f"🔍 Incoming LLM chat request with provider: {client_request_data.provider}"
     )
 
+    # Must stay an async generator, see the note above _buffered_sse.
     return StreamingResponse(
-        generate_chat_completion_stream(service_request_data),
+        _buffered_sse(
+            generate_chat_completion_stream(service_request_data),
+            is_disconnected=http_request.is_disconnected,
+        ),
         media_type="text/event-stream",
     )
 
 
+@app.on_event("shutdown")
+async def close_llm_clients():
+    await aclose_backend_clients()
+
+
 # --- Core API Endpoints (Info, OCR) ---
-@app.get("/api/info", response_model=InfoResponse)
-def get_application_info() -> InfoResponse:
-    return InfoResponse(
+# None of these values change during the process lifetime.
+_INFO_PAYLOAD = orjson.dumps(
+    InfoResponse(
         version=__version__,
         description="Local uiautodev server.",
         platform=platform.system(),
         code_language="Python",
         cwd=os.getcwd(),
         drivers=["android"],
-    )
+    ).model_dump()
+)
+
+
+@app.get("/api/info", response_model=InfoResponse)
+def get_application_info() -> Response:
+    return Response(content=_INFO_PAYLOAD, media_type="application/json")
+
 
+# Bounds concurrent decode/OCR steps to the core count, so a burst of uploads
+# cannot occupy every executor thread.
+_OCR_SLOTS = asyncio.Semaphore(os.cpu_count() or 1)
 
-@app.post("/api/ocr_image", response_model=List[Node])
-async def perform_ocr_on_image(file: UploadFile = File(...)) -> List[Node]:
+# NDJSON lines of finished OCR runs, keyed by a digest of the uploaded bytes.
+# The inspector often re-posts the same screenshot.
+_ocr_cache: LRUCache[Tuple[bytes, ...]] = LRUCache(maxsize=256, ttl=600)
+
+# Serializes nodes straight to JSON bytes; nodes are never re-validated.
+_OCR_NODE_JSON = TypeAdapter(OCRNode)
+
+
+def _digest_upload(fp: BinaryIO) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    while chunk := fp.read(65536):
+        digest.update(chunk)
+    fp.seek(0)
+    return digest.digest()
+
+
+@app.post(
+    "/api/ocr_image",
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+    response_class=StreamingResponse,
+)
+async def perform_ocr_on_image(file: UploadFile = File(...)):
+    """Run OCR on an uploaded image, streaming one JSON node per line"""
     try:
-        image_data = await file.read()
-        image = convert_bytes_to_image(image_data)
-        return ocr_image(image)
+        async with _OCR_SLOTS:
+            cache_key = await asyncio.to_thread(_digest_upload, file.file)
+            cached_lines = _ocr_cache.get(cache_key)
+            if cached_lines is not None:
+                return Response(
+                    content=b"".join(cached_lines), media_type="application/x-ndjson"
+                )
+            # Decode straight from the upload's spooled file, skipping the
+            # intermediate bytes copy, and off the event loop.
+            image = await asyncio.to_thread(convert_bytes_to_image, file.file)
+    except (UnidentifiedImageError, ValueError) as e:
+        # A bad upload is the client's problem; skip the traceback.
+        logger.info(f"Rejected OCR upload that is not a readable image: {e}")
+        return ORJSONResponse(
+            status_code=400, content={"error": "Invalid image", "detail": str(e)}
+        )
     except Exception as e:
         logger.exception("OCR image processing failed.")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500, content={"error": "OCR failed", "detail": str(e)}
         )
-    finally:
-        if hasattr(file, "close") and callable(file.close):
-            try:
-                await file.close()
-            except Exception as e_close:
-                logger.warning(f"Error closing OCR file: {e_close}")
+    # No explicit close: FastAPI closes uploaded files when the request ends.
+
+    # ocr_image is a sync generator doing CPU-bound work; advance it on the
+    # default executor so the event loop stays free between nodes.
+    loop = asyncio.get_running_loop()
+    nodes = ocr_image(image)
+
+    async def next_node() -> Optional[OCRNode]:
+        async with _OCR_SLOTS:
+            return await loop.run_in_executor(None, next, nodes, None)
+
+    # The recognition pass runs before the first node is yielded, so most
+    # failures surface here, while a proper 500 can still be sent.
+    try:
+        first_node = await next_node()
+    except Exception as e:
+        logger.exception("OCR image processing failed.")
+        return ORJSONResponse(
+            status_code=500, content={"error": "OCR failed", "detail": str(e)}
+        )
+
+    async def stream_ocr_nodes() -> AsyncGenerator[bytes, None]:
+        lines: List[bytes] = []
+        node = first_node
+        try:
+            while node is not None:
+                line = _OCR_NODE_JSON.dump_json(node) + b"\n"
+                lines.append(line)
+                yield line
+                node = await next_node()
+        except Exception as e:
+            # Headers are already out; end the body with an error line
+            # instead of silently truncating it.
+            logger.exception("OCR image processing failed while streaming.")
+            yield orjson.dumps({"error": "OCR failed", "detail": str(e)}) + b"\n"
+        else:
+            _ocr_cache.put(cache_key, tuple(lines))
+
+    return StreamingResponse(stream_ocr_nodes(), media_type="application/x-ndjson")
+
+
+# Screenshots, image decoding, OCR and upload hashing run on the loop's
+# default executor. Most of that time is spent waiting on the device or in C
+# code, so the pool is sized well past the core count. Interactive Python
+# sessions use their own executor (see router.device).
+THREAD_POOL_SIZE = int(os.getenv("UIAUTODEV_THREAD_POOL_SIZE", "64"))
+
+
+@app.on_event("startup")
+async def size_default_executor():
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE)
+    )
 
 
 # --- Service Configuration Endpoint ---
@@ -288,68 +637,110 @@ RAG_API_BASE_URL_FOR_FRONTEND = RAG_API_SEARCH_URL_FROM_ENV
 if RAG_API_BASE_URL_FOR_FRONTEND.endswith("/search"):
     RAG_API_BASE_URL_FOR_FRONTEND = RAG_API_BASE_URL_FOR_FRONTEND[: -len("/search")]
 
+# The payload never changes after startup, so serialize it once.
+_SERVICES_JSON = orjson.dumps(
+    ServiceConfigResponse(ragApiBaseUrl=RAG_API_BASE_URL_FOR_FRONTEND).model_dump()
+)
 
-@app.get("/api/config/services", response_model=ServiceConfigResponse)
-async def get_service_configurations():
+
+@app.on_event("startup")
+def log_service_configurations():
     logger.info(
         f"Providing RAG API base URL to frontend: {RAG_API_BASE_URL_FOR_FRONTEND}"
     )
-    return ServiceConfigResponse(ragApiBaseUrl=RAG_API_BASE_URL_FOR_FRONTEND)
+
+
+@app.get("/api/config/services", response_model=ServiceConfigResponse)
+async def get_service_configurations():
+    return Response(content=_SERVICES_JSON, media_type="application/json")
 
 
 # --- Server Control and Static Content ---
+_SHUTDOWN_PAYLOAD = orjson.dumps({"message": "Server shutting down..."})
+
+
 @app.get("/shutdown", summary="Shutdown Server")
-def shutdown_server() -> JSONResponse:
-    logger.info("Shutdown endpoint called. Sending SIGINT to process %d.", os.getpid())
-    os.kill(os.getpid(), signal.SIGINT)
-    return JSONResponse(content={"message": "Server shutting down..."})
+async def shutdown_server() -> Response:
+    # With several workers, stopping this one would only make uvicorn's
+    # supervisor respawn it; signal the supervisor to stop them all.
+    pid = os.getppid() if server_settings().workers > 1 else os.getpid()
+    logger.info("Shutdown endpoint called. Sending SIGINT to process %d.", pid)
+    # Signal from the event loop rather than a threadpool thread; uvicorn's
+    # graceful shutdown still lets this response finish.
+    asyncio.get_running_loop().call_soon(os.kill, pid, signal.SIGINT)
+    return Response(_SHUTDOWN_PAYLOAD, media_type="application/json")
+
+
+# Read once; a changed demo.html is picked up on the next server (re)start.
+_ui_html_file = static_files_path / "demo.html"
+try:
+    _UI_HTML = _ui_html_file.read_bytes()
+    _UI_HTML_ETAG = f'"{hashlib.blake2b(_UI_HTML, digest_size=16).hexdigest()}"'
+except OSError:
+    _UI_HTML = None
+    _UI_HTML_ETAG = ""
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires: any listed tag or "*" """
+    if not if_none_match or not etag:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
 
 
 @app.get("/demo", summary="Serve Local Inspector UI", include_in_schema=True)
-async def serve_local_inspector_ui():
-    ui_html_file = static_files_path / "demo.html"
-    if not ui_html_file.is_file():
-        logger.error(f"UI HTML file not found: {ui_html_file}")
-        return JSONResponse(content={"error": "UI HTML not found."}, status_code=404)
-    return FileResponse(ui_html_file)
+async def serve_local_inspector_ui(request: Request):
+    if _UI_HTML is None:
+        logger.error(f"UI HTML file not found: {_ui_html_file}")
+        return ORJSONResponse(content={"error": "UI HTML not found."}, status_code=404)
+    headers = {"ETag": _UI_HTML_ETAG, "Cache-Control": HTML_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), _UI_HTML_ETAG):
+        return Response(status_code=304, headers=headers)
+    return Response(_UI_HTML, media_type="text/html", headers=headers)
+
+
+try:
+    _LOCAL_UI_URL = app.url_path_for("serve_local_inspector_ui")
+except Exception:
+    _LOCAL_UI_URL = "/demo"
 
 
 @app.get("/", summary="Redirect to Local Inspector UI", include_in_schema=False)
 async def redirect_to_local_ui():
-    try:
-        local_ui_url = app.url_path_for("serve_local_inspector_ui")
-    except Exception:
-        local_ui_url = "/demo"
-    return RedirectResponse(url=local_ui_url)
+    # Permanent, so browsers cache it and go straight to the UI next time.
+    return RedirectResponse(url=_LOCAL_UI_URL, status_code=308)
 
 
 # --- Main Entry Point for Uvicorn ---
 if __name__ == "__main__":
-    server_port = int(os.getenv("UIAUTODEV_PORT", "20242"))
-    server_host = os.getenv("UIAUTODEV_HOST", "127.0.0.1")
-    reload_enabled = os.getenv("UIAUTODEV_RELOAD", "True").lower() in (
-        "true",
-        "1",
-        "yes",
-    )
-    log_level_str = os.getenv("UIAUTODEV_LOG_LEVEL", "info").lower()
+    settings = server_settings()
+    # uvloop is not available on Windows
+    loop_impl = "asyncio" if platform.system() == "Windows" else "uvloop"
 
     logger.info(
-        f"Starting uiautodev server v{__version__} on http://{server_host}:{server_port}"
+        f"Starting uiautodev server v{__version__} on http://{settings.host}:{settings.port}"
+        f" with {settings.workers} worker(s)"
     )
-    if DOTENV_PATH.exists():
+    if _dotenv_found:
         logger.info(f"Loaded .env from: {DOTENV_PATH}")
     else:
         logger.warning(f".env not found at {DOTENV_PATH}. Secrets might be missing.")
-    if not jedi_project:
-        logger.error(
-            "Jedi project could not be initialized. Python completions might be degraded."
-        )
 
     uvicorn.run(
         "uiautodev.app:app",
-        host=server_host,
-        port=server_port,
-        reload=reload_enabled,
-        log_level=log_level_str,
+        host=settings.host,
+        port=settings.port,
+        reload=settings.reload,
+        workers=settings.workers,
+        loop=loop_impl,
+        http="httptools",
+        timeout_keep_alive=settings.keep_alive,
+        limit_concurrency=settings.max_concurrency,
+        backlog=2048,
+        access_log=settings.access_log,
+        log_level=settings.log_level,
     )
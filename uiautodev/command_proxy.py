@@ -79,7 +79,7 @@ def tap(driver: BaseDriver, params: TapRequest):
 def app_install(driver: BaseDriver, params: InstallAppRequest):
     """install app"""
     driver.app_install(params.url)
-    return InstallAppResponse(success=True, id=None)
+    return InstallAppResponse.model_construct(success=True, id=None)
 
 
 @register(Command.APP_CURRENT)
@@ -103,7 +103,7 @@ def app_terminate(driver: BaseDriver, params: AppTerminateRequest):
 @register(Command.GET_WINDOW_SIZE)
 def window_size(driver: BaseDriver) -> WindowSizeResponse:
     wsize = driver.window_size()
-    return WindowSizeResponse(width=wsize[0], height=wsize[1])
+    return WindowSizeResponse.model_construct(width=wsize[0], height=wsize[1])
 
 
 @register(Command.HOME)
@@ -139,7 +139,7 @@ def volume_mute(driver: BaseDriver):
 @register(Command.DUMP)
 def dump(driver: BaseDriver) -> DumpResponse:
     source, _ = driver.dump_hierarchy()
-    return DumpResponse(value=source)
+    return DumpResponse.model_construct(value=source)
 
 
 @register(Command.WAKE_UP)
@@ -167,7 +167,7 @@ def find_elements(
     for node in node_travel(root_node):
         if node_match(node, params.by, params.value):
             nodes.append(node)
-    return FindElementResponse(count=len(nodes), value=nodes)
+    return FindElementResponse.model_construct(count=len(nodes), value=nodes)
 
 
 @register(Command.CLICK_ELEMENT)
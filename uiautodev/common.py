@@ -1,7 +1,7 @@
 import io
 import locale
 import logging
-from typing import List
+from typing import BinaryIO, Iterator, Union
 
 from PIL import Image
 
@@ -27,25 +27,31 @@ def get_webpage_url() -> str:
     return web_url
 
 
-def convert_bytes_to_image(byte_data: bytes) -> Image.Image:
-    return Image.open(io.BytesIO(byte_data))
+def convert_bytes_to_image(byte_data: Union[bytes, BinaryIO]) -> Image.Image:
+    """Decode an image from bytes or a binary file object.
+    The image is fully loaded, so the source can be closed afterwards.
+    """
+    if isinstance(byte_data, (bytes, bytearray)):
+        byte_data = io.BytesIO(byte_data)
+    image = Image.open(byte_data)
+    image.load()
+    return image
 
 
-def ocr_image(image: Image.Image) -> List[OCRNode]:
+def ocr_image(image: Image.Image) -> Iterator[OCRNode]:
+    """Yield OCR nodes one at a time, so callers can stream them"""
     # Placeholder for OCR implementation
     w, h = image.size
     try:
         from ocrmac import ocrmac
     except ImportError:
         logger.error("OCR is not supported on this platform")
-        return []
+        return
     result = ocrmac.OCR(image).recognize()
-    nodes = []
     for index, (text, confidence, pbounds) in enumerate(result):
-        print(f"OCR result: {text}, confidence: {confidence}, bounds: {pbounds}")
-        # bounds = int(pbounds[0]*w), int(pbounds[1]*h), int(pbounds[2]*w), int(pbounds[3]*h)
-        nodes.append(
-            OCRNode(key=str(index), name=text, bounds=pbounds, confidence=confidence)
+        logger.debug(
+            "OCR result: %s, confidence: %s, bounds: %s", text, confidence, pbounds
         )
-    return nodes
+        # bounds = int(pbounds[0]*w), int(pbounds[1]*h), int(pbounds[2]*w), int(pbounds[3]*h)
+        yield OCRNode(key=str(index), name=text, bounds=pbounds, confidence=confidence)
 
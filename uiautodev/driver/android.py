@@ -1,3 +1,4 @@
+import base64
 import logging
 import re
 import time
@@ -33,6 +34,19 @@ class AndroidDriver(BaseDriver):
             )
         return self.ud.screenshot()
 
+    def screenshot_bytes(self, id: int) -> Tuple[bytes, str]:
+        if id > 0:
+            raise AndroidDriverException(
+                "multi-display is not supported yet for uiautomator2"
+            )
+        # Same capture ud.screenshot() starts from: a JPEG encoded on the device
+        data = self.ud.jsonrpc.takeScreenshot(1, 80)
+        if data:
+            return base64.b64decode(data), "image/jpeg"
+        # takeScreenshot may return None, fall back to screencap (PNG)
+        png = self.adb_device.shell(["screencap", "-p"], encoding=None)
+        return png, "image/png"
+
     def shell(self, command: str) -> ShellResponse:
         try:
             ret = self.adb_device.shell2(command, rstrip=True, timeout=20)
@@ -82,7 +96,7 @@ class AndroidDriver(BaseDriver):
 
     def app_current(self) -> CurrentAppResponse:
         info = self.adb_device.app_current()
-        return CurrentAppResponse(
+        return CurrentAppResponse.model_construct(
             package=info.package, activity=info.activity, pid=info.pid
         )
 
@@ -123,13 +137,19 @@ class AndroidDriver(BaseDriver):
             results.append(AppInfo(packageName=packageName))
         return results
 
-    def open_app_file(self, package: str) -> Iterator[bytes]:
+    def _app_file_path(self, package: str) -> str:
         line = self.adb_device.shell(f"pm path {package}")
         if not line.startswith("package:"):
             raise AndroidDriverException(f"Failed to get package path: {line}")
-        remote_path = line.split(":", 1)[1]
+        return line.split(":", 1)[1]
+
+    def open_app_file(self, package: str) -> Iterator[bytes]:
+        remote_path = self._app_file_path(package)
         yield from self.adb_device.sync.iter_content(remote_path)
 
+    def app_file_size(self, package: str) -> int:
+        return self.adb_device.sync.stat(self._app_file_path(package)).size
+
 
 def parse_xml(
     xml_data: str, wsize: WindowSize, display_id: Optional[int] = None
@@ -21,6 +21,14 @@ class BaseDriver(abc.ABC):
         """
         raise NotImplementedError()
 
+    def screenshot_bytes(self, id: int) -> Tuple[bytes, str]:
+        """Take a screenshot as the encoded image the device produced,
+        without decoding it into a PIL image
+        :param id: physical display ID to capture (normally: 0)
+        :return: image bytes, media type
+        """
+        raise NotImplementedError()
+
     @abc.abstractmethod
     def dump_hierarchy(self) -> Tuple[str, Node]:
         """Dump the view hierarchy of the device
@@ -98,3 +106,6 @@ class BaseDriver(abc.ABC):
         """open app file"""
         raise NotImplementedError()
 
+    def app_file_size(self, package: str) -> int:
+        """size in bytes of the app file open_app_file streams"""
+        raise NotImplementedError()
@@ -5,7 +5,7 @@ import typing  # Import the 'typing' module itself
 from typing import Optional  # Specific types from 'typing'
 from typing import Any, Dict, List, Tuple, Union
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class DeviceInfo(BaseModel):
@@ -33,8 +33,11 @@ class Node(BaseModel):
     name: str  # can be seen as description
     bounds: Optional[Tuple[float, float, float, float]] = None
     rect: Optional[Rect] = None
-    properties: Dict[str, Union[str, bool]] = {}
-    children: List[Node] = []  # Forward reference to Node itself
+    # default_factory rather than a literal: pydantic deep-copies mutable
+    # defaults for every instance, which adds up over large trees.
+    properties: Dict[str, Union[str, bool]] = Field(default_factory=dict)
+    # Forward reference to Node itself
+    children: List[Node] = Field(default_factory=list)
 
 
 class OCRNode(Node):  # Inherits from Node
@@ -77,6 +80,8 @@ class ChatMessageContent(BaseModel):
 
 
 class LlmServiceChatRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     prompt: str
     context: Dict[str, Any] = Field(default_factory=dict)
     history: List[ChatMessageContent] = Field(default_factory=list)
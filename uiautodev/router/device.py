@@ -1,12 +1,15 @@
 import asyncio
 import io
 import logging
+import os
 import traceback
-from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
+import orjson
 from fastapi import APIRouter, Body, HTTPException, Path
-from fastapi.responses import JSONResponse, Response, StreamingResponse
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
 
 from uiautodev import command_proxy
 from uiautodev.command_types import (
@@ -17,161 +20,202 @@ from uiautodev.command_types import (
     InteractiveCodePayload,
     TapRequest,
 )
-from uiautodev.driver.android import AndroidDriver
 from uiautodev.model import DeviceInfo, Node, ShellResponse
 from uiautodev.provider import BaseProvider
 from uiautodev.utils.interactive_executor import execute_interactive_code
 
 logger = logging.getLogger(__name__)
 
+# Handlers below return pre-serialized bytes: response_model stays on the
+# routes for the OpenAPI schema, but FastAPI's jsonable_encoder pass and
+# re-validation are skipped for a returned Response.
+_DEVICE_LIST_JSON = TypeAdapter(List[DeviceInfo])
+_ANY_JSON = TypeAdapter(Any)
+
+
+def _json_response(content: Union[str, bytes]) -> Response:
+    return Response(content=content, media_type="application/json")
+
+
+def _error_response(message: str, status_code: int = 500, **fields: Any) -> Response:
+    """Error body {**fields, "error": message}, serialized straight with orjson"""
+    return Response(
+        content=orjson.dumps({**fields, "error": message}),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def _interactive_error(stderr: str, execution_error: str) -> Response:
+    """
+    Failures of /interactive_python keep the session output shape and a 200,
+    so the editor console renders them like a script's own error.
+    """
+    return _json_response(
+        orjson.dumps(
+            {
+                "stdout": "",
+                "stderr": stderr,
+                "result": None,
+                "execution_error": execution_error,
+            }
+        )
+    )
+
+
+# Interactive sessions hold a thread for as long as the user's script runs,
+# so they get their own pool rather than starving screenshots and OCR on the
+# loop's default executor.
+INTERACTIVE_THREADS = int(os.getenv("UIAUTODEV_INTERACTIVE_THREADS", "32"))
+_INTERACTIVE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=INTERACTIVE_THREADS, thread_name_prefix="interactive-python"
+)
+
+
+# adb sync hands back files in <=64 KiB DATA packets, and StreamingResponse
+# hops to a worker thread for every item of a sync iterator. Regrouping into
+# larger pieces cuts those hops and the matching socket writes.
+BACKUP_CHUNK_SIZE = 256 * 1024
+
+
+def _rechunk(chunks: Iterator[bytes], size: int) -> Iterator[bytes]:
+    buf = bytearray()
+    for chunk in chunks:
+        buf += chunk
+        if len(buf) >= size:
+            yield bytes(buf)
+            buf.clear()
+    if buf:
+        yield bytes(buf)
+
 
 class AndroidShellPayload(BaseModel):
     command: str
 
 
 def make_router(provider: BaseProvider) -> APIRouter:
-    router = APIRouter()
+    router = APIRouter(default_response_class=ORJSONResponse)
 
     @router.get("/list", response_model=List[DeviceInfo])
-    def list_devices() -> Union[List[DeviceInfo], JSONResponse]:
+    def list_devices() -> Response:
         """List devices"""
         try:
-            return provider.list_devices()
+            return _json_response(_DEVICE_LIST_JSON.dump_json(provider.list_devices()))
         except NotImplementedError:
             logger.warning(
                 f"list_devices not implemented for provider: {type(provider).__name__}"
             )
-            return JSONResponse(
-                content={"error": "list_devices not implemented"}, status_code=501
-            )
+            return _error_response("list_devices not implemented", 501)
         except Exception as e:
             logger.exception("list_devices failed")
-            return JSONResponse(content={"error": str(e)}, status_code=500)
+            return _error_response(str(e))
 
     @router.post("/{serial}/shell", response_model=ShellResponse)
-    def run_android_shell(
-        serial: str, payload: AndroidShellPayload
-    ) -> Union[ShellResponse, JSONResponse]:
+    def run_android_shell(serial: str, payload: AndroidShellPayload) -> Response:
         """Run a shell command on an Android device"""
         try:
             driver = provider.get_device_driver(serial)
             shell_result = driver.shell(payload.command)
 
             if isinstance(shell_result, ShellResponse):
-                return shell_result
+                return _json_response(shell_result.model_dump_json())
             elif (
                 isinstance(shell_result, dict) and "output" in shell_result
             ):  # Attempt to construct if dict matches
                 try:
-                    return ShellResponse(**shell_result)
+                    shell_response = ShellResponse(**shell_result)
                 except Exception:  # Pydantic validation error
                     logger.error(
                         f"Shell result dict could not be parsed into ShellResponse: {shell_result}"
                     )
-                    return JSONResponse(
-                        content={"output": "", "error": "Shell result format error"},
-                        status_code=500,
-                    )
+                    return _error_response("Shell result format error", output="")
+                return _json_response(shell_response.model_dump_json())
             elif isinstance(shell_result, str):
-                return ShellResponse(output=shell_result, error=None)
+                shell_response = ShellResponse(output=shell_result, error=None)
+                return _json_response(shell_response.model_dump_json())
             else:
                 logger.error(
                     f"Unexpected shell result type: {type(shell_result)} for command: {payload.command}"
                 )
-                return JSONResponse(
-                    content={
-                        "output": "",
-                        "error": "Unexpected shell result type from driver",
-                    },
-                    status_code=500,
+                return _error_response(
+                    "Unexpected shell result type from driver", output=""
                 )
         except NotImplementedError:
             logger.warning(
                 f"Shell command not implemented for driver type used with {serial}"
             )
-            return JSONResponse(
-                content={
-                    "output": "",
-                    "error": "Shell not implemented for this driver type",
-                },
-                status_code=501,
+            return _error_response(
+                "Shell not implemented for this driver type", 501, output=""
             )
         except Exception as e:
             logger.exception(f"Shell command failed for {serial}")
-            return JSONResponse(
-                content={"output": "", "error": str(e)}, status_code=500
-            )
+            return _error_response(str(e), output="")
 
     @router.post(
         "/{serial}/interactive_python", response_model=Dict[str, Optional[Any]]
     )
     async def run_interactive_python(
         serial: str, payload: InteractiveCodePayload
-    ) -> Dict[str, Optional[Any]]:
+    ) -> Response:
         logger.info(
             f"Received interactive python for {serial}. Code: {payload.code[:100]}..."
         )
         try:
             driver_instance = provider.get_device_driver(serial)
-            if not isinstance(driver_instance, AndroidDriver):
+            # Only AndroidDriver carries a uiautomator2 device (.ud)
+            u2_device = getattr(driver_instance, "ud", None)
+            if u2_device is None:
                 logger.warning(
                     f"Interactive Python attempted on non-Android driver for serial {serial}"
                 )
-                return {
-                    "stdout": "",
-                    "stderr": "Interactive Python execution is only for Android devices.",
-                    "result": None,
-                    "execution_error": "Driver type not supported.",
-                }
+                return _interactive_error(
+                    "Interactive Python execution is only for Android devices.",
+                    "Driver type not supported.",
+                )
 
-            u2_device = getattr(driver_instance, "ud", None)
-            if not u2_device:
-                logger.error(f"AndroidDriver for {serial} missing .ud instance")
-                return {
-                    "stdout": "",
-                    "stderr": "Failed to get uiautomator2 instance.",
-                    "result": None,
-                    "execution_error": "Internal server error.",
-                }
-
-            loop = asyncio.get_event_loop()
             enable_tracing_flag = getattr(payload, "enable_tracing", False)
-            structured_output_dict = await loop.run_in_executor(
-                None,
+            structured_output_dict = await asyncio.get_running_loop().run_in_executor(
+                _INTERACTIVE_EXECUTOR,
                 execute_interactive_code,
                 payload.code,
                 u2_device,
                 enable_tracing_flag,
             )
-            return structured_output_dict
+            return _json_response(orjson.dumps(structured_output_dict))
         except HTTPException:
             raise
         except Exception as e:
             logger.exception(
                 f"Unhandled error executing interactive python for {serial}"
             )
-            return {
-                "stdout": "",
-                "stderr": f"Internal server error: {str(e)}",
-                "result": None,
-                "execution_error": traceback.format_exc(),
-            }
+            return _interactive_error(
+                f"Internal server error: {str(e)}", traceback.format_exc()
+            )
 
     @router.get(
         "/{serial}/screenshot/{id}",
-        responses={200: {"content": {"image/jpeg": {}}}},
+        responses={200: {"content": {"image/jpeg": {}, "image/png": {}}}},
         response_class=Response,
     )
-    def take_screenshot(serial: str, id: int) -> Response:
-        try:
+    async def take_screenshot(serial: str, id: int) -> Response:
+        def capture() -> Tuple[bytes, str]:
             driver = provider.get_device_driver(serial)
+            try:
+                # Pass the device's own encoding through untouched
+                return driver.screenshot_bytes(id)
+            except NotImplementedError:
+                pass
             pil_img = driver.screenshot(id).convert("RGB")
-            buf = io.BytesIO()
-            pil_img.save(buf, format="JPEG")
-            return Response(content=buf.getvalue(), media_type="image/jpeg")
+            with io.BytesIO() as buf:
+                pil_img.save(buf, format="JPEG")
+                return buf.getvalue(), "image/jpeg"
+
+        try:
+            content, media_type = await asyncio.to_thread(capture)
+            return Response(content=content, media_type=media_type)
         except Exception as e:
             logger.exception(f"Screenshot failed for {serial}")
-            return JSONResponse(content={"error": str(e)}, status_code=500)
+            return _error_response(str(e))
 
     # MODIFIED for Hierarchy JSON serialization
     @router.get(
@@ -188,106 +232,92 @@ def make_router(provider: BaseProvider) -> APIRouter:
             if format == "xml":
                 return Response(content=xml_data, media_type="application/xml")
             elif format == "json":
-                # Let FastAPI serialize the Pydantic model directly.
                 # This assumes hierarchy_node_model is a Pydantic model instance.
                 if hierarchy_node_model:
-                    return hierarchy_node_model
+                    return _json_response(hierarchy_node_model.model_dump_json())
                 else:
                     # Handle case where hierarchy_node_model might be None but format is json
                     logger.warning(
                         f"Hierarchy data for JSON format is None for serial {serial}"
                     )
-                    return JSONResponse(
-                        content={"error": "Hierarchy data is null"}, status_code=404
+                    return _error_response(
+                        "Hierarchy data is null", 404
                     )  # Or 200 with empty data
             else:
                 logger.warning(f"Invalid format requested for hierarchy: {format}")
-                return JSONResponse(
-                    content={
-                        "error": f"Invalid format: {format}. Valid formats are 'json' or 'xml'."
-                    },
-                    status_code=400,
+                return _error_response(
+                    f"Invalid format: {format}. Valid formats are 'json' or 'xml'.",
+                    400,
                 )
         except Exception as e:
             logger.exception(f"Dump hierarchy failed for {serial}")
-            return JSONResponse(content={"error": str(e)}, status_code=500)
+            return _error_response(str(e))
 
     @router.post("/{serial}/command/tap", response_model=Dict[str, str])
-    def run_command_tap(
-        serial: str, params: TapRequest
-    ) -> Union[Dict[str, str], JSONResponse]:
+    def run_command_tap(serial: str, params: TapRequest) -> Response:
         try:
             driver = provider.get_device_driver(serial)
             command_proxy.tap(driver, params)
-            return {"status": "ok"}
+            return _json_response(b'{"status":"ok"}')
         except Exception as e:
             logger.exception(f"Tap command failed for {serial}")
-            return JSONResponse(
-                content={"error": str(e), "status": "error"}, status_code=500
-            )
+            return _error_response(str(e), status="error")
 
     @router.post("/{serial}/command/installApp", response_model=InstallAppResponse)
-    def run_install_app(
-        serial: str, params: InstallAppRequest
-    ) -> Union[InstallAppResponse, JSONResponse]:
+    def run_install_app(serial: str, params: InstallAppRequest) -> Response:
         try:
             driver = provider.get_device_driver(serial)
-            return command_proxy.app_install(driver, params)
+            result = command_proxy.app_install(driver, params)
+            return _json_response(result.model_dump_json())
         except Exception as e:
             logger.exception(f"Install app failed for {serial}")
-            # Constructing a valid InstallAppResponse for error, or use JSONResponse
-            # This assumes InstallAppResponse has these fields, or they are Optional
-            return JSONResponse(
-                content={"success": False, "reason": str(e), "error": str(e)},
-                status_code=500,
-            )
+            return _error_response(str(e), success=False, reason=str(e))
 
     @router.get("/{serial}/command/currentApp", response_model=CurrentAppResponse)
-    def get_current_app(serial: str) -> Union[CurrentAppResponse, JSONResponse]:
+    def get_current_app(serial: str) -> Response:
         try:
             driver = provider.get_device_driver(serial)
-            return command_proxy.app_current(driver)
+            current_app = command_proxy.app_current(driver)
+            return _json_response(current_app.model_dump_json())
         except Exception as e:
             logger.exception(f"Get current app failed for {serial}")
-            # Ensure all fields for CurrentAppResponse are provided or optional
-            return JSONResponse(
-                content={
-                    "package": None,
-                    "activity": None,
-                    "pid": None,
-                    "error": str(e),
-                },
-                status_code=500,
-            )
+            return _error_response(str(e), package=None, activity=None, pid=None)
 
     @router.post("/{serial}/command/{command}")
     def run_command_proxy_other(
         serial: str, command: Command, params: Optional[Dict[str, Any]] = Body(None)
-    ) -> Any:  # Return type Any as command_proxy.send_command can vary
+    ) -> Response:
         try:
             driver = provider.get_device_driver(serial)
             actual_params = params if params is not None else {}
+            # send_command returns a model, a list of models, or None
             response = command_proxy.send_command(driver, command, actual_params)
-            return response
+            return _json_response(_ANY_JSON.dump_json(response))
         except Exception as e:
             command_value = getattr(command, "value", str(command))
             logger.exception(f"Command '{command_value}' failed for {serial}")
-            return JSONResponse(content={"error": str(e)}, status_code=500)
+            return _error_response(str(e))
 
     @router.get("/{serial}/backupApp")
     def run_backup_app(serial: str, packageName: str) -> Response:
         try:
             driver = provider.get_device_driver(serial)
-            app_file_stream = driver.open_app_file(packageName)
             file_name = f"{packageName}.apk"
             headers = {"Content-Disposition": f'attachment; filename="{file_name}"'}
+            try:
+                # Also surfaces a bad package name as a 500 here, before the
+                # stream has started
+                headers["Content-Length"] = str(driver.app_file_size(packageName))
+            except NotImplementedError:
+                pass
+            app_file_stream = driver.open_app_file(packageName)
             return StreamingResponse(
-                app_file_stream,
+                _rechunk(app_file_stream, BACKUP_CHUNK_SIZE),
                 headers=headers,
                 media_type="application/vnd.android.package-archive",
             )
         except Exception as e:
             logger.exception(f"Backup app failed for {serial}, package {packageName}")
-            return JSONResponse(content={"error": str(e)}, status_code=500)
+            return _error_response(str(e))
 
     return router
@@ -0,0 +1,28 @@
+# uiautodev/services/llm/backends/client.py
+
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+    logger.info("h2 is not installed; LLM backends will use HTTP/1.1")
+
+
+def new_async_client() -> httpx.AsyncClient:
+    """
+    Build the pooled client a backend shares across requests. With h2
+    installed, concurrent chats multiplex over one TLS connection.
+    """
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        # Long reads for slow generations, but fail fast on an unreachable API
+        timeout=httpx.Timeout(120.0, connect=10.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
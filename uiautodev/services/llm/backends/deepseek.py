@@ -1,14 +1,25 @@
 import asyncio
-import json
 import logging
 import os
 from typing import Any, AsyncGenerator, Dict, List, Optional
 
 import httpx
+import orjson
 from model import ChatMessageContent, LlmServiceChatRequest
 
 from ..prompt.messages import build_llm_payload_messages
 from ..tools.rag import fetch_rag_code_snippets
+from .client import new_async_client
+from .sse import (
+    END_COMPLETE,
+    END_EXCEPTION,
+    END_FAILED,
+    END_TERMINATED,
+    iter_sse_lines,
+    read_error_message,
+    sse_data,
+    sse_error,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +27,31 @@ DEEPSEEK_API_URL = "https://api.deepseek.com/chat/completions"
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
 DEEPSEEK_DEFAULT_MODEL = os.getenv("DEEPSEEK_MODEL", "deepseek-chat")
 
+_HEADERS = {
+    "Content-Type": "application/json",
+    "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
+}
+
+# Shared across requests so streams reuse pooled keep-alive connections
+# instead of paying a TCP + TLS handshake to the API on every chat turn.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = new_async_client()
+    return _client
+
+
+async def aclose_client() -> None:
+    """Close the shared DeepSeek HTTP client, if one was created"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
 RAG_TOOL_DEFINITION = [
     {
         "type": "function",
@@ -39,10 +75,10 @@ RAG_TOOL_DEFINITION = [
 
 async def generate_chat_completion_stream(
     request_data: LlmServiceChatRequest,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     if not DEEPSEEK_API_KEY:
-        yield f"event: error\ndata: {json.dumps({'error': 'DeepSeek API key is not configured'})}\n\n"
-        yield f"event: end-of-stream\ndata: {json.dumps({'message': 'Stream terminated'})}\n\n"
+        yield sse_error("DeepSeek API key is not configured")
+        yield END_TERMINATED
         return
 
     messages = build_llm_payload_messages(
@@ -51,61 +87,60 @@ async def generate_chat_completion_stream(
         history=request_data.history,
     )
 
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
-    }
-
     tool_choice_setting = "auto"
     full_response_content = ""
     tool_calls_to_process: Optional[List[Dict[str, Any]]] = None
 
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        try:
-            payload = {
-                "model": request_data.model or DEEPSEEK_DEFAULT_MODEL,
-                "messages": messages,
-                "stream": True,
-                "temperature": request_data.temperature or 0.7,
-                "max_tokens": request_data.max_tokens or 2048,
-                "tools": RAG_TOOL_DEFINITION,
-                "tool_choice": tool_choice_setting,
-            }
-
-            async with client.stream(
-                "POST", DEEPSEEK_API_URL, json=payload, headers=headers
-            ) as response:
-                if response.status_code != 200:
-                    err = await response.aread()
-                    yield f"event: error\ndata: {json.dumps({'error': err.decode(errors='replace')})}\n\n"
-                    yield f"event: end-of-stream\ndata: {json.dumps({'message': 'Stream failed'})}\n\n"
+    client = _get_client()
+    try:
+        payload = {
+            "model": request_data.model or DEEPSEEK_DEFAULT_MODEL,
+            "messages": messages,
+            "stream": True,
+            "temperature": request_data.temperature or 0.7,
+            "max_tokens": request_data.max_tokens or 2048,
+            "tools": RAG_TOOL_DEFINITION,
+            "tool_choice": tool_choice_setting,
+        }
+
+        async with client.stream(
+            "POST", DEEPSEEK_API_URL, json=payload, headers=_HEADERS
+        ) as response:
+            if response.status_code != 200:
+                err = await read_error_message(response)
+                yield sse_error(err)
+                yield END_FAILED
+                return
+
+            async for line in iter_sse_lines(response):
+                if line == b"data: [DONE]":
+                    yield END_COMPLETE
                     return
 
-                async for line in response.aiter_lines():
-                    if line == "data: [DONE]":
-                        yield f"event: end-of-stream\ndata: {json.dumps({'message': 'Complete'})}\n\n"
-                        return
+                if not line.startswith(b"data: "):
+                    continue
 
-                    if not line.startswith("data: "):
+                try:
+                    data = orjson.loads(line[6:])
+                    choices = data.get("choices")
+                    if not choices:
                         continue
-
-                    try:
-                        data = json.loads(line[6:])
-                        choice = data.get("choices", [{}])[0]
-                        delta = choice.get("delta", {})
-
-                        if delta.get("content"):
-                            yield f"data: {json.dumps(delta['content'])}\n\n"
-
+                    choice = choices[0]
+                    delta = choice.get("delta")
+                    if delta:
+                        content = delta.get("content")
+                        if content:
+                            yield sse_data(content)
                         if delta.get("tool_calls"):
                             tool_calls_to_process = delta["tool_calls"]
 
-                        finish_reason = choice.get("finish_reason")
-                        if finish_reason == "tool_calls" and tool_calls_to_process:
+                    finish_reason = choice.get("finish_reason")
+                    if finish_reason == "tool_calls" and tool_calls_to_process:
+                        try:
                             for tool_call in tool_calls_to_process:
                                 fn = tool_call["function"]["name"]
                                 tool_id = tool_call["id"]
-                                args = json.loads(
+                                args = orjson.loads(
                                     tool_call["function"].get("arguments", "{}")
                                 )
                                 query = args.get("query")
@@ -124,11 +159,12 @@ async def generate_chat_completion_stream(
                                     }
                                 )
                             tool_choice_setting = "none"
-
-                    except Exception as e:
-                        logger.warning(f"DeepSeek stream chunk parse error: {e}")
-
-        except Exception as e:
-            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
-            yield f"event: end-of-stream\ndata: {json.dumps({'message': 'Stream exception'})}\n\n"
-            return
+                        except (KeyError, TypeError, orjson.JSONDecodeError) as e:
+                            logger.warning(f"DeepSeek tool call parse error: {e}")
+                except Exception as e:
+                    logger.warning(f"DeepSeek stream chunk parse error: {e}")
+
+    except Exception as e:
+        yield sse_error(str(e))
+        yield END_EXCEPTION
+        return
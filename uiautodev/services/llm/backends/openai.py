@@ -1,16 +1,27 @@
 # uiautodev/services/llm/backends/openai.py
 
 import asyncio
-import json
 import logging
 import os
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, Optional
 
 import httpx
+import orjson
 from model import ChatMessageContent, LlmServiceChatRequest
 
 from ..prompt.messages import build_llm_payload_messages
 from ..tools.rag import fetch_rag_code_snippets
+from .client import new_async_client
+from .sse import (
+    END_COMPLETE,
+    END_EXCEPTION,
+    END_FAILED,
+    END_TERMINATED,
+    iter_sse_lines,
+    read_error_message,
+    sse_data,
+    sse_error,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -18,18 +29,42 @@ OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
 
+_HEADERS = {
+    "Content-Type": "application/json",
+    "Authorization": f"Bearer {OPENAI_API_KEY}",
+}
+
+# Shared across requests so streams reuse pooled keep-alive connections
+# instead of paying a TCP + TLS handshake to the API on every chat turn.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = new_async_client()
+    return _client
+
+
+async def aclose_client() -> None:
+    """Close the shared OpenAI HTTP client, if one was created"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 async def generate_chat_completion_stream(
     request_data: LlmServiceChatRequest,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """
     Stream chat completions from OpenAI using the user prompt and context.
     Injects relevant RAG documentation into the context before generation.
     """
 
     if not OPENAI_API_KEY:
-        yield f"event: error\ndata: {json.dumps({'error': 'OpenAI API key is not configured'})}\n\n"
-        yield f"event: end-of-stream\ndata: {json.dumps({'message': 'Stream terminated'})}\n\n"
+        yield sse_error("OpenAI API key is not configured")
+        yield END_TERMINATED
         return
 
     # -------------------------
@@ -53,11 +88,6 @@ async def generate_chat_completion_stream(
         history=request_data.history,
     )
 
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {OPENAI_API_KEY}",
-    }
-
     payload = {
         "model": request_data.model or OPENAI_DEFAULT_MODEL,
         "messages": messages,
@@ -69,39 +99,38 @@ async def generate_chat_completion_stream(
     # ------------------------------
     # 🚀 Start OpenAI streaming request
     # ------------------------------
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        try:
-            async with client.stream(
-                "POST", OPENAI_API_URL, json=payload, headers=headers
-            ) as response:
-                if response.status_code != 200:
-                    err = await response.aread()
-                    logger.error(f"❌ OpenAI returned non-200: {response.status_code}")
-                    yield f"event: error\ndata: {json.dumps({'error': err.decode(errors='replace')})}\n\n"
-                    yield f"event: end-of-stream\ndata: {json.dumps({'message': 'Stream failed'})}\n\n"
+    client = _get_client()
+    try:
+        async with client.stream(
+            "POST", OPENAI_API_URL, json=payload, headers=_HEADERS
+        ) as response:
+            if response.status_code != 200:
+                err = await read_error_message(response)
+                logger.error(f"❌ OpenAI returned non-200: {response.status_code}")
+                yield sse_error(err)
+                yield END_FAILED
+                return
+
+            async for line in iter_sse_lines(response):
+                if line == b"data: [DONE]":
+                    yield END_COMPLETE
                     return
 
-                async for line in response.aiter_lines():
-                    if line == "data: [DONE]":
-                        yield f"event: end-of-stream\ndata: {json.dumps({'message': 'Complete'})}\n\n"
-                        return
-
-                    if not line.startswith("data: "):
-                        continue
-
-                    try:
-                        data = json.loads(line[6:])
-                        choice = data.get("choices", [{}])[0]
-                        delta = choice.get("delta", {})
-
-                        if delta.get("content"):
-                            yield f"data: {json.dumps(delta['content'])}\n\n"
-
-                    except Exception as e:
-                        logger.warning(f"⚠️ OpenAI stream parse error: {e}")
-
-        except Exception as e:
-            logger.exception("🔥 Exception during OpenAI stream")
-            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
-            yield f"event: end-of-stream\ndata: {json.dumps({'message': 'Stream exception'})}\n\n"
-            return
+                if not line.startswith(b"data: "):
+                    continue
+
+                try:
+                    data = orjson.loads(line[6:])
+                    choices = data.get("choices")
+                    delta = choices[0].get("delta") if choices else None
+                    content = delta.get("content") if delta else None
+                    if content:
+                        yield sse_data(content)
+                except Exception as e:
+                    logger.warning(f"⚠️ OpenAI stream parse error: {e}")
+
+    except Exception as e:
+        logger.exception("🔥 Exception during OpenAI stream")
+        yield sse_error(str(e))
+        yield END_EXCEPTION
+        return
@@ -2,12 +2,13 @@ from typing import AsyncGenerator
 
 from uiautodev.model import LlmServiceChatRequest
 
+from ..tools import rag
 from . import deepseek, openai  # 👈 relative import
 
 
 async def dispatch_chat_completion_stream(
     request_data: LlmServiceChatRequest,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """
     Routes the request to the appropriate LLM backend based on the selected provider.
     """
@@ -21,3 +22,10 @@ async def dispatch_chat_completion_stream(
             yield chunk
     else:
         raise ValueError(f"Unsupported provider: {provider}")
+
+
+async def aclose_clients() -> None:
+    """Close the HTTP clients the backends keep between requests."""
+    await deepseek.aclose_client()
+    await openai.aclose_client()
+    await rag.aclose_client()
@@ -0,0 +1,75 @@
+# uiautodev/services/llm/backends/sse.py
+
+from typing import Any, AsyncIterator
+
+import httpx
+import orjson
+
+# Frames are built as bytes: StreamingResponse would otherwise encode every
+# yielded str to UTF-8 again on its way out.
+
+
+def sse_data(data: Any) -> bytes:
+    """Format a bare `data:` frame carrying a JSON value."""
+    return b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """Format a named event frame carrying a JSON value."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+def sse_error(message: str) -> bytes:
+    return sse_event("error", {"error": message})
+
+
+# End-of-stream frames never change, so they are encoded once.
+END_COMPLETE = sse_event("end-of-stream", {"message": "Complete"})
+END_FAILED = sse_event("end-of-stream", {"message": "Stream failed"})
+END_EXCEPTION = sse_event("end-of-stream", {"message": "Stream exception"})
+END_TERMINATED = sse_event("end-of-stream", {"message": "Stream terminated"})
+
+
+async def iter_sse_lines(response: httpx.Response) -> AsyncIterator[bytes]:
+    """
+    Split an upstream SSE body into lines without decoding it to str.
+    Cheaper than response.aiter_lines(), which decodes every chunk and
+    handles every kind of newline; SSE lines end in LF or CRLF.
+    """
+    buf = bytearray()
+    async for chunk in response.aiter_bytes():
+        buf += chunk
+        start = 0
+        while (end := buf.find(b"\n", start)) != -1:
+            line = bytes(buf[start:end])
+            start = end + 1
+            yield line[:-1] if line.endswith(b"\r") else line
+        del buf[:start]
+    if buf:
+        yield bytes(buf)
+
+
+# Upstream error bodies are small JSON envelopes; anything past this is a
+# verbose dump that would only be forwarded to the UI verbatim.
+ERROR_BODY_LIMIT = 16 * 1024
+
+
+async def read_error_message(response: httpx.Response) -> str:
+    """
+    Read at most ERROR_BODY_LIMIT bytes of a non-200 upstream response and
+    return its {"error": {"message": ...}} text, or the raw body if it is not
+    that shape.
+    """
+    buf = bytearray()
+    async for chunk in response.aiter_bytes():
+        buf += chunk
+        if len(buf) >= ERROR_BODY_LIMIT:
+            break
+    body = bytes(buf[:ERROR_BODY_LIMIT])
+    try:
+        error = orjson.loads(body).get("error")
+    except (orjson.JSONDecodeError, AttributeError):
+        error = None
+    if isinstance(error, dict) and isinstance(error.get("message"), str):
+        return error["message"]
+    return body.decode(errors="replace")
@@ -1,20 +1,79 @@
-import json
 import os
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
+import orjson
+
 from uiautodev.model import ChatMessageContent
 
+# Only the end of the console output and the start of a traceback are sent
+# to the model.
+CONSOLE_OUTPUT_TAIL_CHARS = 1000
+TRACEBACK_HEAD_CHARS = 3000
+
+# Long conversations keep their opening exchange and the most recent
+# messages; the middle is dropped to bound prompt size and prefill latency.
+HISTORY_MAX_MESSAGES = int(os.getenv("LLM_HISTORY_MAX_MESSAGES", "20"))
+HISTORY_HEAD_MESSAGES = min(2, HISTORY_MAX_MESSAGES)
+HISTORY_TAIL_MESSAGES = HISTORY_MAX_MESSAGES - HISTORY_HEAD_MESSAGES
 
+
+@lru_cache(maxsize=1)
 def load_system_prompt() -> str:
     """
     Load the system prompt from the local system_prompt.txt file.
     This is the instruction given to the model to define its behavior.
+    Read once per process; restart the server to pick up edits.
     """
     system_prompt_path = os.path.join(os.path.dirname(__file__), "system_prompt.txt")
     with open(system_prompt_path, "r", encoding="utf-8") as f:
         return f.read()
 
 
+def _window_history(
+    history: List[ChatMessageContent], user_prompt: str
+) -> List[ChatMessageContent]:
+    """
+    Trim history to the configured head + tail window. The web UI pushes the
+    prompt into its history before sending, so a trailing copy of it is dropped
+    (it is sent again, with context, as the final user message). Cuts never
+    leave tool results without the assistant tool_calls message before them,
+    or tool_calls without their results.
+    """
+    if history and history[-1].role == "user" and history[-1].content == user_prompt:
+        history = history[:-1]
+    if len(history) <= HISTORY_MAX_MESSAGES:
+        return history
+
+    head = history[:HISTORY_HEAD_MESSAGES]
+    while head and (head[-1].tool_calls or head[-1].role == "tool"):
+        head = head[:-1]
+    tail = (
+        history[len(history) - HISTORY_TAIL_MESSAGES :] if HISTORY_TAIL_MESSAGES else []
+    )
+    start = 0
+    while start < len(tail) and tail[start].role == "tool":
+        start += 1
+    return head + tail[start:]
+
+
+def _history_message(msg: ChatMessageContent) -> Dict[str, Any]:
+    """
+    Same result as msg.model_dump(exclude_none=True), built by hand for the
+    flat fields; only the rare tool_calls list goes through pydantic.
+    """
+    message: Dict[str, Any] = {"role": msg.role, "content": msg.content}
+    if msg.name is not None:
+        message["name"] = msg.name
+    if msg.tool_call_id is not None:
+        message["tool_call_id"] = msg.tool_call_id
+    if msg.tool_calls is not None:
+        message["tool_calls"] = [
+            call.model_dump(exclude_none=True) for call in msg.tool_calls
+        ]
+    return message
+
+
 def build_llm_payload_messages(
     user_prompt: str,
     context_data: Dict[str, Any],
@@ -36,8 +95,8 @@ def build_llm_payload_messages(
     ]
 
     # Step 3: Append prior conversation history (if any)
-    for msg in history:
-        messages.append(msg.model_dump(exclude_none=True))
+    history = _window_history(history, user_prompt)
+    messages.extend([_history_message(msg) for msg in history])
 
     # Step 4: Build a context block to send with the final user message
     context_sections: List[str] = []
@@ -52,7 +111,7 @@ def build_llm_payload_messages(
     # Include traceback if Python error captured
     if trace := context_data.get("pythonLastErrorTraceback"):
         context_sections.append(
-            f"## ❗ Last Python Error Traceback:\n```text\n{trace[:3000]}\n```"
+            f"## ❗ Last Python Error Traceback:\n```text\n{trace[:TRACEBACK_HEAD_CHARS]}\n```"
         )
 
     # Include current code in editor
@@ -63,7 +122,8 @@ def build_llm_payload_messages(
 
     # UI element selection (from screen)
     if sel_elements := context_data.get("selectedElements"):
-        limited = json.dumps(sel_elements[:3], indent=2)
+        # Compact JSON: indentation only costs prompt tokens
+        limited = orjson.dumps(sel_elements[:3]).decode()
         context_sections.append(f"## 🎯 Selected UI Elements:\n```json\n{limited}\n```")
 
     # UI hierarchy snapshot (compact summary)
@@ -76,21 +136,22 @@ def build_llm_payload_messages(
 
     # Last known console output
     if out := context_data.get("pythonConsoleOutput"):
-        context_sections.append(f"## 🖥️ Python Console Output:\n```\n{out[-1000:]}\n```")
+        context_sections.append(
+            f"## 🖥️ Python Console Output:\n```\n{out[-CONSOLE_OUTPUT_TAIL_CHARS:]}\n```"
+        )
 
     # Device metadata (model, resolution, etc.)
     if devinfo := context_data.get("deviceInfo"):
-        devjson = json.dumps(devinfo, indent=2)
+        devjson = orjson.dumps(devinfo).decode()
         context_sections.append(f"## 📱 Device Info:\n```json\n{devjson}\n```")
 
-    # Step 5: Merge all context sections into one block
-    context_blob = "\n\n".join(context_sections).strip()
-
-    # Step 6: Place user intent *first*, followed by supporting context
+    # Step 5-6: Place user intent *first*, followed by supporting context,
+    # joined in one pass
+    request = user_prompt.strip()
     final_prompt = (
-        f"## 🧠 User Request:\n{user_prompt.strip()}\n\n{context_blob}"
-        if context_blob
-        else user_prompt.strip()
+        "\n\n".join([f"## 🧠 User Request:\n{request}", *context_sections])
+        if context_sections
+        else request
     )
 
     # Step 7: Append the final prompt to the message chain
@@ -1,11 +1,13 @@
 # uiautodev/services/llm/tools/rag.py
 
-import json
 import logging
 import os
 from typing import Any, Dict, List, Optional
 
 import httpx
+import orjson
+
+from uiautodev.utils.cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,32 @@ COCOINDEX_SEARCH_API_URL = os.getenv(
 
 MAX_RAG_SNIPPET_LEN_FOR_LLM = 7000
 
+# Formatted context keyed by (whitespace-normalized query, top_k). Retries and
+# repeated tool calls within a chat ask the same thing; the index changes
+# rarely, so a few minutes of staleness is fine. Failures are not cached.
+_snippet_cache: LRUCache[str] = LRUCache(maxsize=256, ttl=300)
+
+# Shared across tool calls so repeat queries reuse a keep-alive connection to
+# the search API. Plain-HTTP localhost, so HTTP/2 would not be negotiated.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=15.0, limits=httpx.Limits(max_keepalive_connections=20)
+        )
+    return _client
+
+
+async def aclose_client() -> None:
+    """Close the shared RAG HTTP client, if one was created"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 async def fetch_rag_code_snippets(query: str, top_k: int = 5) -> str:
     """
@@ -25,50 +53,68 @@ async def fetch_rag_code_snippets(query: str, top_k: int = 5) -> str:
         logger.error("RAG: COCOINDEX_SEARCH_API_URL is not configured.")
         return "Error: RAG service URL not configured for snippet retrieval."
 
+    cache_key = (" ".join(query.split()), top_k)
+    cached = _snippet_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            logger.info(
-                f"RAG: Querying {COCOINDEX_SEARCH_API_URL} for: '{query[:80]}...'"
+        logger.info(f"RAG: Querying {COCOINDEX_SEARCH_API_URL} for: '{query[:80]}...'")
+        response = await _get_client().get(
+            COCOINDEX_SEARCH_API_URL, params={"query": query, "limit": top_k}
+        )
+        # Status errors are expected answers from the service, not exceptions:
+        # a 404 means no index has been built yet.
+        if response.status_code == 404:
+            logger.warning("RAG: Search API returned 404, no snippet index available.")
+            return "Note: No code snippet index is available (RAG). Proceeding with general knowledge."
+        if response.is_error:
+            logger.error(
+                f"RAG: HTTP Status Error contacting RAG service: {response.status_code}"
             )
-            response = await client.get(
-                COCOINDEX_SEARCH_API_URL, params={"query": query, "limit": top_k}
+            return "Note: The code snippet retrieval service (RAG) failed with a server error. Proceeding with general knowledge."
+
+        results = orjson.loads(response.content).get("results") or []
+        if not results:
+            context_str = "No specific code snippets found in the uiautomator2 codebase relevant to this query."
+            _snippet_cache.put(cache_key, context_str)
+            return context_str
+
+        # --- Format successful results for the LLM ---
+        parts = ["Relevant uiautomator2 Code Snippets Found:\n\n"]
+        total_len = len(parts[0])
+        max_individual = MAX_RAG_SNIPPET_LEN_FOR_LLM // top_k
+
+        for i, r in enumerate(results):
+            filename = r.get("filename", "N/A")
+            score = r.get("score", 0.0)
+            text = r.get("text", "")
+
+            if len(text) > max_individual:
+                text = text[: max_individual - 50] + "... (truncated)"
+
+            block = (
+                f"Snippet {i+1} (from {filename}, score: {score:.2f}):\n"
+                f"```python\n{text.strip()}\n```\n\n"
+            )
+            parts.append(block)
+            total_len += len(block)
+            if total_len > MAX_RAG_SNIPPET_LEN_FOR_LLM:
+                # Everything past here would be cut off below anyway
+                break
+
+        context_str = "".join(parts)
+        if total_len > MAX_RAG_SNIPPET_LEN_FOR_LLM:
+            context_str = (
+                context_str[: MAX_RAG_SNIPPET_LEN_FOR_LLM - 100]
+                + "\n... (overall RAG context truncated)"
             )
-            response.raise_for_status()  # This will raise an exception for 4xx or 5xx statuses
-
-            results = response.json().get("results", [])
-            if not results:
-                return "No specific code snippets found in the uiautomator2 codebase relevant to this query."
-
-            # --- Format successful results for the LLM ---
-            context_str = "Relevant uiautomator2 Code Snippets Found:\n\n"
-            max_individual = MAX_RAG_SNIPPET_LEN_FOR_LLM // top_k
-
-            for i, r in enumerate(results):
-                filename = r.get("filename", "N/A")
-                score = r.get("score", 0.0)
-                text = r.get("text", "")
-
-                if len(text) > max_individual:
-                    text = text[: max_individual - 50] + "... (truncated)"
-
-                context_str += f"Snippet {i+1} (from {filename}, score: {score:.2f}):\n"
-                context_str += "```python\n"
-                context_str += text.strip() + "\n```\n\n"
-
-            if len(context_str) > MAX_RAG_SNIPPET_LEN_FOR_LLM:
-                context_str = (
-                    context_str[: MAX_RAG_SNIPPET_LEN_FOR_LLM - 100]
-                    + "\n... (overall RAG context truncated)"
-                )
 
-            return context_str.strip()
+        context_str = context_str.strip()
+        _snippet_cache.put(cache_key, context_str)
+        return context_str
 
     # --- Resilient Error Handling ---
-    except httpx.HTTPStatusError as e:
-        # Catches 4xx and 5xx errors from the RAG service.
-        logger.error(f"RAG: HTTP Status Error contacting RAG service: {e}")
-        return "Note: The code snippet retrieval service (RAG) failed with a server error. Proceeding with general knowledge."
-
     except httpx.RequestError as e:
         # Catches network-level errors, like connection refused, timeout, etc.
         logger.error(f"RAG: Network error contacting RAG service: {e}")
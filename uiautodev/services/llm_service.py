@@ -1,7 +1,7 @@
-import json
 import logging
 from typing import AsyncGenerator
 
+import orjson
 from model import LlmServiceChatRequest
 from services.llm.backends import router
 from services.llm.tools.rag import fetch_rag_code_snippets
@@ -11,7 +11,7 @@ logger = logging.getLogger(__name__)
 
 async def generate_chat_completion_stream(
     request_data: LlmServiceChatRequest,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """
     Main entry point for the LLM service. This function now buffers the
     complete response from the LLM to detect if it's a structured JSON tool
@@ -32,19 +32,19 @@ async def generate_chat_completion_stream(
     async for chunk in router.dispatch_chat_completion_stream(request_data):
         full_response_parts.append(chunk)
 
-    full_response = "".join(full_response_parts)
+    full_response = b"".join(full_response_parts)
 
     if not full_response:
         logger.warning("[LLM SERVICE] Received an empty response from the backend.")
-        yield ""
+        yield b""
         return
 
     # --- Tool Call Detection Logic ---
     # Check if the complete response is our structured JSON tool call.
     stripped_response = full_response.strip()
-    if stripped_response.startswith("{") and stripped_response.endswith("}"):
+    if stripped_response.startswith(b"{") and stripped_response.endswith(b"}"):
         try:
-            parsed_json = json.loads(stripped_response)
+            parsed_json = orjson.loads(stripped_response)
             # Verify it's the tool we expect.
             if parsed_json.get("tool_name") == "propose_edit":
                 logger.info(
@@ -52,7 +52,7 @@ async def generate_chat_completion_stream(
                 )
                 yield stripped_response
                 return  # End execution after forwarding the tool call.
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             # It looked like JSON, but wasn't valid. Fall through to treat as text.
             logger.warning(
                 "[LLM SERVICE] Failed to parse potential JSON, treating as plain text."
@@ -62,3 +62,8 @@ async def generate_chat_completion_stream(
     # If it's not a valid tool call, treat it as a standard text message.
     logger.info("[LLM SERVICE] Forwarding standard text response.")
     yield full_response
+
+
+async def aclose_backend_clients() -> None:
+    """Close the LLM backends' shared HTTP clients on server shutdown."""
+    await router.aclose_clients()
@@ -0,0 +1,45 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+_V = TypeVar("_V")
+
+
+class LRUCache(Generic[_V]):
+    """A small bounded mapping that evicts the least recently used entry.
+    With ttl (seconds) set, entries also expire that long after being put.
+
+    usage example:
+        cache = LRUCache(maxsize=128)
+        cache.put(key, value)
+        value = cache.get(key)  # None on miss
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], _V]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[_V]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: _V) -> None:
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,193 @@
+"""
+Jedi-backed Python completions for the inspector's code editor.
+
+Jedi inference is CPU-bound and can take seconds on the first touch of a
+large library, so completions run in a pool of worker processes instead of
+on the server's event loop. Keep this module light on imports: workers
+started with the "spawn" method re-import it, and only the workers need jedi.
+"""
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from uiautodev.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# (text to insert, text shown in the dropdown, completion type)
+CompletionTuple = Tuple[str, str, Optional[str]]
+CompletionResult = Tuple[CompletionTuple, ...]
+
+# Each worker preloads PRELOAD_MODULES, so every extra worker costs hundreds
+# of MB; one is plenty for a single user typing in the editor.
+COMPLETION_WORKERS = max(1, int(os.getenv("UIAUTODEV_COMPLETION_WORKERS", "1")))
+
+# Only the first N completions get their lazy (inference-heavy) attributes
+# resolved; the rest are returned by name only. Same idea as pylsp's
+# resolve_at_most_labels setting.
+COMPLETION_RESOLVE_LIMIT = int(os.getenv("UIAUTODEV_COMPLETION_RESOLVE_LIMIT", "25"))
+
+# Large libraries whose first completion is slow (seconds); each worker
+# parses them up front so user requests hit a warm cache.
+PRELOAD_MODULES = [
+    name.strip()
+    for name in os.getenv(
+        "UIAUTODEV_PRELOAD_MODULES", "numpy,pandas,uiautomator2,adbutils"
+    ).split(",")
+    if name.strip()
+]
+
+# Opt-in: hand jedi a pruned sys.path (project root, stdlib, numpy/pandas)
+# and disable smart_sys_path, trading third-party completions for a much
+# cheaper project resolve.
+JEDI_FAST = os.getenv("UIAUTODEV_JEDI_FAST", "0").lower() in ("true", "1", "yes")
+
+# Keyed by (code digest, path, line, column). Repeat requests for the same
+# buffer and cursor position (common while typing) skip jedi entirely.
+_completion_cache: LRUCache[CompletionResult] = LRUCache(maxsize=512)
+
+# Per-worker jedi.Project, created once by _init_worker.
+_jedi_project = None
+
+# Per-worker jedi.Script objects keyed by (path, sha1 of code). A Script can
+# complete at any position, so cursor moves within an unchanged buffer reuse
+# the parsed tree instead of re-parsing the whole file.
+_script_cache: LRUCache = LRUCache(maxsize=32)
+
+
+def _project_sys_path() -> List[str]:
+    if not JEDI_FAST:
+        return list(sys.path)
+    return [str(PROJECT_ROOT)] + [
+        p
+        for p in sys.path
+        if "site-packages" not in p or p.endswith(("numpy", "pandas"))
+    ]
+
+
+def _init_worker(project_path: str, sys_path: List[str], smart_sys_path: bool) -> None:
+    """
+    Initializes jedi inside a worker process, so the smart_sys_path scan
+    is paid once per worker rather than once per request.
+    """
+    global _jedi_project
+    try:
+        import jedi
+
+        jedi.settings.fast_parser = True
+        _jedi_project = jedi.Project(
+            path=project_path,
+            sys_path=sys_path,
+            smart_sys_path=smart_sys_path,
+            added_sys_path=[],
+        )
+    except Exception as e:
+        logger.error(f"Failed to initialize Jedi Project: {e}", exc_info=True)
+        _jedi_project = None
+        return
+
+    if PRELOAD_MODULES:
+        try:
+            jedi.preload_module(*PRELOAD_MODULES)
+        except Exception as e:
+            logger.warning(f"Jedi preload of {PRELOAD_MODULES} failed: {e}")
+
+
+def _noop() -> None:
+    pass
+
+
+def _do_complete(
+    code: str, path: Optional[str], line: int, column: int
+) -> List[CompletionTuple]:
+    """
+    Runs in a worker process. Returns plain tuples so results pickle cheaply.
+    :param line: 1-based line number, as jedi expects
+    :param column: 0-based column number
+    """
+    if _jedi_project is None:
+        logger.error("Jedi project not initialized, cannot provide completions.")
+        return []
+
+    import jedi
+
+    key = (path, hashlib.sha1(code.encode()).digest())
+    script = _script_cache.get(key)
+    if script is None:
+        script = jedi.Script(code=code, path=path, project=_jedi_project)
+        _script_cache.put(key, script)
+    completions = script.complete(line=line, column=column)
+    results: List[CompletionTuple] = []
+    for i, comp in enumerate(completions):
+        text = getattr(comp, "complete", comp.name)
+        if i < COMPLETION_RESOLVE_LIMIT:
+            results.append(
+                (text, getattr(comp, "name_with_symbols", comp.name), comp.type)
+            )
+        else:
+            results.append((text, comp.name, None))
+    return results
+
+
+# Created on first use and dropped again by shutdown_pool, so the server can
+# start it again (tests, in-process reloads). Spawned workers re-import this
+# module but never call _get_pool, so they build no pool of their own.
+_jedi_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _jedi_pool
+    if _jedi_pool is None:
+        # Spawn, never fork: the pool is started from inside the server's
+        # running event loop, and forking a process with live threads is
+        # unsafe.
+        _jedi_pool = ProcessPoolExecutor(
+            max_workers=COMPLETION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(PROJECT_ROOT), _project_sys_path(), not JEDI_FAST),
+        )
+    return _jedi_pool
+
+
+async def complete_code(
+    code: str, path: Optional[str], line: int, column: int
+) -> CompletionResult:
+    """Complete code at (line, column) without blocking the event loop"""
+    code_hash = hashlib.blake2b(code.encode(), digest_size=16).digest()
+    key = (code_hash, path, line, column)
+    cached = _completion_cache.get(key)
+    if cached is not None:
+        return cached
+
+    loop = asyncio.get_running_loop()
+    completions = await loop.run_in_executor(
+        _get_pool(), _do_complete, code, path, line, column
+    )
+    result = tuple(completions)
+    _completion_cache.put(key, result)
+    return result
+
+
+def warm_up_pool() -> None:
+    """Start the workers now, so jedi init and preloading happen before the
+    first completion request instead of during it"""
+    _get_pool().submit(_noop)
+
+
+def shutdown_pool() -> None:
+    """Stop the worker processes, dropping any queued completions. The next
+    completion or warm_up_pool starts a fresh pool."""
+    global _jedi_pool
+    if _jedi_pool is not None:
+        _jedi_pool.shutdown(wait=False, cancel_futures=True)
+        _jedi_pool = None